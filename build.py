@@ -11,12 +11,12 @@
 # such person has been advised of the possibility of such damages.
 
 import argparse
-import subprocess
 from typing import List
 import tempfile, shutil, os, re, glob
 import urllib.request
 
 from scripts import yaml_utils
+from scripts.codegen_runner import get_codegen_runner
 from scripts.file_utils import replace_text
 from scripts.language_handler import get_language_handler, get_config_file
 
@@ -64,7 +64,7 @@ def fix_camel_case_issues(directory):
 
 
 def build(source: str, build_output_root_dir: str, product: str, language: str, versions: List[str],
-          swagger_jar_url: str, java_binary: str, artifact_version: str):
+          swagger_jar_url: str, java_binary: str, artifact_version: str, runner: str = 'jvm'):
 
     prefix = get_product_prefix(product)
     launguage_handler = get_language_handler(product, language)
@@ -105,6 +105,8 @@ def build(source: str, build_output_root_dir: str, product: str, language: str,
 
     first_version = True
 
+    codegen_runner = get_codegen_runner(runner, java_binary, swagger_jar, working_dir)
+
     for version in versions:
         build_output_dir = os.path.join(build_output_root_dir, f"{version}")
         if os.path.isdir(build_output_dir) and len(os.listdir(build_output_dir)) != 0:
@@ -116,33 +118,8 @@ def build(source: str, build_output_root_dir: str, product: str, language: str,
         os.mkdir(generator_output_dir)
 
         print("Generating client for version " + version)
-        process = [java_binary,
-                   '-DapiTests=false',
-                   '-DmodelTests=false',
-                   '-DapiDocs=false',
-                   '-DmodelDocs=false',
-                   '-jar',
-                   swagger_jar,
-                   'generate',
-                   '-i',
-                   os.path.join(source_dir, 'specs', f"{prefix}{version}.spec.yaml"),
-                   '-o',
-                   generator_output_dir,
-                   '-l',
-                   language,
-                   '-c',
-                   get_config_file(config_dir, version)]
-        print("Running Swagger Codegen with following command: " + " ".join(process))
-        result = subprocess.run(process,
-                                capture_output=True,
-                                text=True)
-
-        try:
-            result.check_returncode()
-        except subprocess.CalledProcessError:
-            print(result.stdout)
-            print(result.stderr)
-            raise
+        codegen_runner.generate(os.path.join(source_dir, 'specs', f"{prefix}{version}.spec.yaml"), generator_output_dir,
+                                language, get_config_file(config_dir, version))
 
         launguage_handler.post_process(version, generator_output_dir, working_dir, build_output_root_dir, artifact_version,
                                        first_version)
@@ -153,6 +130,8 @@ def build(source: str, build_output_root_dir: str, product: str, language: str,
         print("Generated SDK available at: " + build_output_dir)
         first_version = False
 
+    codegen_runner.close()
+
     print("Cleaning up")
     shutil.rmtree(working_dir)
 
@@ -173,6 +152,11 @@ def main():
                         default='https://repo1.maven.org/maven2/io/swagger/swagger-codegen-cli/2.4.28/swagger-codegen-cli-2.4.28.jar',
                         required=False)
     parser.add_argument('--artifact-version', help='Version of generated artifact', default='1.0.0', required=False)
+    parser.add_argument('--codegen-runner', choices=['jvm', 'process'],
+                        help='Run Swagger Codegen for all versions in a single JVM, or in a new JVM for each version. '
+                             'Defaults to "jvm", which falls back to "process" if no javac is found next to the Java '
+                             'binary.',
+                        default='jvm', required=False)
 
     args = parser.parse_args()
 
@@ -181,7 +165,7 @@ def main():
         exit(1)
 
     build(args.source, args.target, args.product, args.language, args.versions, args.swagger_gen, args.java_binary,
-          args.artifact_version)
+          args.artifact_version, args.codegen_runner)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,136 @@
+# The sample script and documentation are provided AS IS and are not supported by
+# the author or the author's employer, unless otherwise agreed in writing. You bear
+# all risk relating to the use or performance of the sample script and documentation.
+# The author and the author's employer disclaim all express or implied warranties
+# (including, without limitation, any warranties of merchantability, title, infringement
+# or fitness for a particular purpose). In no event shall the author, the author's employer
+# or anyone else involved in the creation, production, or delivery of the scripts be liable
+# for any damages whatsoever arising out of the use or performance of the sample script and
+# documentation (including, without limitation, damages for loss of business profits,
+# business interruption, loss of business information, or other pecuniary loss), even if
+# such person has been advised of the possibility of such damages.
+
+import os
+import subprocess
+
+# System properties passed to Swagger Codegen, which disable the generation of tests and docs
+codegen_system_properties = ['-DapiTests=false',
+                             '-DmodelTests=false',
+                             '-DapiDocs=false',
+                             '-DmodelDocs=false']
+
+launcher_source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "java", "CodegenLauncher.java")
+
+
+class ProcessCodegenRunner:
+    """Runs Swagger Codegen in a new JVM for each spec"""
+    def __init__(self, java_binary, swagger_jar):
+        self.java_binary = java_binary
+        self.swagger_jar = swagger_jar
+
+    def generate(self, spec, output_dir, language, config_file):
+        process = [self.java_binary,
+                   *codegen_system_properties,
+                   '-jar',
+                   self.swagger_jar,
+                   'generate',
+                   '-i',
+                   spec,
+                   '-o',
+                   output_dir,
+                   '-l',
+                   language,
+                   '-c',
+                   config_file]
+        print("Running Swagger Codegen with following command: " + " ".join(process))
+        result = subprocess.run(process,
+                                capture_output=True,
+                                text=True)
+
+        try:
+            result.check_returncode()
+        except subprocess.CalledProcessError:
+            print(result.stdout)
+            print(result.stderr)
+            raise
+
+    def close(self):
+        pass
+
+
+class JvmCodegenRunner:
+    """
+    Runs Swagger Codegen for every spec in a single long-lived JVM, so JVM startup, class loading and JIT warm-up are
+    only paid once. The bundled CodegenLauncher is compiled against the Swagger Codegen jar, and is sent one job per spec.
+    """
+    def __init__(self, java_binary, javac_binary, swagger_jar, working_dir):
+        launcher_dir = os.path.join(working_dir, 'launcher')
+        os.mkdir(launcher_dir)
+        result = subprocess.run([javac_binary, '-cp', swagger_jar, '-d', launcher_dir, launcher_source],
+                                capture_output=True,
+                                text=True)
+        try:
+            result.check_returncode()
+        except subprocess.CalledProcessError:
+            print(result.stdout)
+            print(result.stderr)
+            raise
+
+        self.log_file_name = os.path.join(working_dir, 'codegen.log')
+        self.log_file = open(self.log_file_name, 'w')
+        process = [java_binary,
+                   *codegen_system_properties,
+                   '-cp',
+                   os.pathsep.join([swagger_jar, launcher_dir]),
+                   'CodegenLauncher']
+        print("Starting Swagger Codegen with following command: " + " ".join(process))
+        self.process = subprocess.Popen(process,
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        stderr=self.log_file,
+                                        text=True)
+
+    def generate(self, spec, output_dir, language, config_file):
+        print(f"Running Swagger Codegen on {spec}")
+        log_start = os.path.getsize(self.log_file_name)
+        self.process.stdin.write('\t'.join([spec, output_dir, language, config_file]) + '\n')
+        self.process.stdin.flush()
+        result = self.process.stdout.readline().strip()
+        if result == 'OK':
+            return
+
+        with open(self.log_file_name, 'r') as log:
+            log.seek(log_start)
+            print(log.read())
+        if result == '':
+            raise Exception(f"Swagger Codegen exited with code {self.process.wait()} while generating {spec}")
+        raise Exception(f"Swagger Codegen failed to generate {spec}")
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.log_file.close()
+
+
+def _find_javac(java_binary):
+    javac_name = 'javac.exe' if java_binary.lower().endswith('.exe') else 'javac'
+    for java in [java_binary, os.path.realpath(java_binary)]:
+        javac = os.path.join(os.path.dirname(java), javac_name)
+        if os.path.isfile(javac):
+            return javac
+    return None
+
+
+def get_codegen_runner(runner, java_binary, swagger_jar, working_dir):
+    if runner == 'jvm':
+        javac = _find_javac(java_binary)
+        if javac is None:
+            print("WARNING: javac not found next to " + java_binary + ", running Swagger Codegen once per version")
+        else:
+            try:
+                return JvmCodegenRunner(java_binary, javac, swagger_jar, working_dir)
+            except subprocess.CalledProcessError:
+                print("WARNING: Failed to compile the codegen launcher, running Swagger Codegen once per version")
+
+    return ProcessCodegenRunner(java_binary, swagger_jar)
@@ -0,0 +1,50 @@
+import io.swagger.codegen.ClientOptInput;
+import io.swagger.codegen.DefaultGenerator;
+import io.swagger.codegen.config.CodegenConfigurator;
+
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+
+/**
+ * Runs Swagger Codegen for several specs in a single JVM.
+ *
+ * Reads one job per line from stdin, as the tab separated spec, output directory, language and config file, and
+ * generates it the same way as the generate command of the CLI. Once a job is done, "OK" or "FAILED" is written on its
+ * own line to stdout. Everything else, generator logs included, is written to stderr. Stops at the first empty line,
+ * or at the end of stdin.
+ */
+public class CodegenLauncher {
+    public static void main(String[] args) throws Exception {
+        PrintStream results = System.out;
+        System.setOut(System.err);
+
+        BufferedReader jobs = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+        String job;
+        while ((job = jobs.readLine()) != null && !job.isEmpty()) {
+            String[] fields = job.split("\t");
+            try {
+                generate(fields[0], fields[1], fields[2], fields[3]);
+                results.println("OK");
+            } catch (Throwable t) {
+                t.printStackTrace();
+                results.println("FAILED");
+            }
+            System.err.flush();
+            results.flush();
+        }
+    }
+
+    private static void generate(String spec, String outputDir, String language, String configFile) {
+        CodegenConfigurator configurator = CodegenConfigurator.fromFile(configFile);
+        if (configurator == null) {
+            configurator = new CodegenConfigurator();
+        }
+        configurator.setInputSpec(spec);
+        configurator.setOutputDir(outputDir);
+        configurator.setLang(language);
+
+        ClientOptInput clientOptInput = configurator.toClientOptInput();
+        new DefaultGenerator().opts(clientOptInput).generate();
+    }
+}
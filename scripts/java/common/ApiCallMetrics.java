@@ -0,0 +1,109 @@
+package {{invokerPackage}};
+
+/**
+ * Metrics of a single API call, reported to an {@link InstrumentationListener}.
+ */
+public class ApiCallMetrics {
+    private final String operation;
+    private final String method;
+    private final String host;
+    private final long requestBytes;
+    private final long startNanos;
+    int statusCode = -1;
+    long responseBytes;
+    int retries;
+    long durationNanos;
+    boolean reported;
+
+    ApiCallMetrics(String operation, String method, String host, long requestBytes) {
+        this.operation = operation;
+        this.method = method;
+        this.host = host;
+        this.requestBytes = requestBytes;
+        this.startNanos = System.nanoTime();
+    }
+
+    /**
+     * Name of the generated API method that made the call, without its "Call" suffix. This is the operationId of the
+     * API spec as converted to a Java method name by Swagger Codegen, so it may differ from the spec in case and
+     * characters.
+     *
+     * @return Operation name, or null for requests not made by a generated API
+     */
+    public String getOperation() {
+        return operation;
+    }
+
+    /**
+     * HTTP method of the call
+     *
+     * @return HTTP method
+     */
+    public String getMethod() {
+        return method;
+    }
+
+    /**
+     * Host the call was made to
+     *
+     * @return Host name
+     */
+    public String getHost() {
+        return host;
+    }
+
+    /**
+     * HTTP status code of the response, or -1 if no response was received
+     *
+     * @return Status code
+     */
+    public int getStatusCode() {
+        return statusCode;
+    }
+
+    /**
+     * Size of the request body in bytes, or -1 if unknown
+     *
+     * @return Request size
+     */
+    public long getRequestBytes() {
+        return requestBytes;
+    }
+
+    /**
+     * Number of response body bytes read
+     *
+     * @return Response size
+     */
+    public long getResponseBytes() {
+        return responseBytes;
+    }
+
+    /**
+     * Number of times the call was retried by the client's {@link RetryPolicy}. Redirects and authentication
+     * follow-ups made by the HTTP client are not counted.
+     *
+     * @return Retry count
+     */
+    public int getRetryCount() {
+        return retries;
+    }
+
+    /**
+     * Time from the start of the call until its response was read, or it failed
+     *
+     * @return Duration in nanoseconds
+     */
+    public long getDurationNanos() {
+        return durationNanos;
+    }
+
+    boolean complete() {
+        if (reported) {
+            return false;
+        }
+        reported = true;
+        durationNanos = System.nanoTime() - startNanos;
+        return true;
+    }
+}
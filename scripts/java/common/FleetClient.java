@@ -0,0 +1,157 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.ConnectionPool;
+
+import java.io.Closeable;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.CancellationException;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.LinkedBlockingQueue;
+import java.util.concurrent.RejectedExecutionException;
+import java.util.concurrent.ScheduledThreadPoolExecutor;
+import java.util.concurrent.ThreadFactory;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Client running operations concurrently on a fleet of arrays.
+ *
+ * Each array has its own {@link ApiClient}, but all of them share one connection pool, and operations run on a fixed
+ * number of threads shared by the whole fleet. Results are returned as each array answers, see {@link FleetResults}.
+ * An array that doesn't answer in time has the connection its operation is using closed, so its thread is released
+ * for the other arrays.
+ *
+ * <pre>
+ * FleetClient fleet = new FleetClient(16);
+ * fleet.addArray("array1", "https://array1.example.com").setApiKey(...);
+ * for (FleetResult&lt;VolumeGetResponse&gt; result : fleet.execute(new FleetOperation&lt;VolumeGetResponse&gt;() {
+ *     public VolumeGetResponse call(ApiClient apiClient) throws Exception {
+ *         return new VolumesApi(apiClient).getVolumes(...);
+ *     }
+ * }, 30, TimeUnit.SECONDS)) {
+ *     ...
+ * }
+ * </pre>
+ */
+public class FleetClient implements Closeable {
+    private final ExecutorService executor;
+    private final ScheduledThreadPoolExecutor timer;
+    private final ConnectionPool connectionPool;
+    private final Set<FleetTask<?>> activeTasks =
+        Collections.newSetFromMap(new ConcurrentHashMap<FleetTask<?>, Boolean>());
+    private final Map<String, ApiClient> arrays = new LinkedHashMap<String, ApiClient>();
+
+    /**
+     * @param threads Number of operations run at once across the fleet
+     */
+    public FleetClient(int threads) {
+        final AtomicInteger threadCount = new AtomicInteger();
+        ThreadFactory threadFactory = new ThreadFactory() {
+            @Override
+            public Thread newThread(Runnable runnable) {
+                Thread thread = new Thread(runnable, "fleet-client-" + threadCount.incrementAndGet());
+                thread.setDaemon(true);
+                return thread;
+            }
+        };
+        this.executor = Executors.newFixedThreadPool(threads, threadFactory);
+        this.timer = new ScheduledThreadPoolExecutor(1, threadFactory);
+        this.timer.setRemoveOnCancelPolicy(true);
+        this.connectionPool = new ConnectionPool(threads, TimeUnit.MINUTES.toMillis(5));
+    }
+
+    /**
+     * Add an array to the fleet with a new client. The client must then be set up with the array's credentials.
+     *
+     * @param name Name identifying the array in the results
+     * @param basePath Base path of the array's REST API
+     * @return Client of the array
+     */
+    public ApiClient addArray(String name, String basePath) {
+        return addArray(name, new ApiClient().setBasePath(basePath));
+    }
+
+    /**
+     * Add an array to the fleet, replacing any array with the same name. The client is switched to the fleet's
+     * connection pool, and gets a network interceptor letting the fleet close the connections of operations that time
+     * out.
+     *
+     * @param name Name identifying the array in the results
+     * @param apiClient Client of the array
+     * @return Client of the array
+     */
+    public synchronized ApiClient addArray(String name, ApiClient apiClient) {
+        apiClient.getHttpClient().setConnectionPool(connectionPool);
+        if (!apiClient.getHttpClient().networkInterceptors().contains(FleetTask.SOCKET_TRACKER)) {
+            apiClient.getHttpClient().networkInterceptors().add(FleetTask.SOCKET_TRACKER);
+        }
+        arrays.put(name, apiClient);
+        return apiClient;
+    }
+
+    /**
+     * Remove an array from the fleet
+     *
+     * @param name Name of the array
+     * @return Client of the array, or null if there is no array with this name
+     */
+    public synchronized ApiClient removeArray(String name) {
+        return arrays.remove(name);
+    }
+
+    /**
+     * Get the arrays of the fleet
+     *
+     * @return Copy of the map of array names to their clients
+     */
+    public synchronized Map<String, ApiClient> getArrays() {
+        return new LinkedHashMap<String, ApiClient>(arrays);
+    }
+
+    /**
+     * Run an operation on every array of the fleet
+     *
+     * @param operation Operation to run
+     * @param timeout Time each array has to answer, from the moment its operation starts running
+     * @param unit Unit of the timeout
+     * @param <T> Type of the result of the operation
+     * @return Results, in the order the arrays answer
+     */
+    public <T> FleetResults<T> execute(FleetOperation<T> operation, long timeout, TimeUnit unit) {
+        BlockingQueue<FleetResult<T>> results = new LinkedBlockingQueue<FleetResult<T>>();
+        List<FleetTask<T>> tasks = new ArrayList<FleetTask<T>>();
+        for (Map.Entry<String, ApiClient> array : getArrays().entrySet()) {
+            FleetTask<T> task = new FleetTask<T>(array.getKey(), array.getValue(), operation, unit.toNanos(timeout),
+                timer, results, activeTasks);
+            tasks.add(task);
+            activeTasks.add(task);
+            try {
+                executor.execute(task);
+            } catch (RejectedExecutionException e) {
+                task.abort(e);
+            }
+        }
+        return new FleetResults<T>(results, tasks);
+    }
+
+    /**
+     * Stop the fleet's threads, cancelling any running or waiting operation, and close the pooled connections
+     */
+    @Override
+    public void close() {
+        executor.shutdownNow();
+        timer.shutdownNow();
+        for (FleetTask<?> task : activeTasks) {
+            task.abort(new CancellationException("Fleet client closed"));
+        }
+        connectionPool.evictAll();
+    }
+}
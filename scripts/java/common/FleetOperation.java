@@ -0,0 +1,17 @@
+package {{invokerPackage}};
+
+/**
+ * Operation run by a {@link FleetClient} on each array, typically a call to one of the generated APIs.
+ *
+ * @param <T> Type of the result of the operation
+ */
+public interface FleetOperation<T> {
+    /**
+     * Run the operation on one array
+     *
+     * @param apiClient Client of the array
+     * @return Result of the operation
+     * @throws Exception If the operation fails
+     */
+    T call(ApiClient apiClient) throws Exception;
+}
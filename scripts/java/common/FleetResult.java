@@ -0,0 +1,55 @@
+package {{invokerPackage}};
+
+/**
+ * Result of a {@link FleetOperation} on one array: either the value it returned, or the error it failed with.
+ *
+ * @param <T> Type of the result of the operation
+ */
+public class FleetResult<T> {
+    private final String array;
+    private final T result;
+    private final Throwable error;
+
+    FleetResult(String array, T result, Throwable error) {
+        this.array = array;
+        this.result = result;
+        this.error = error;
+    }
+
+    /**
+     * Name the array was added to the fleet with
+     *
+     * @return Array name
+     */
+    public String getArray() {
+        return array;
+    }
+
+    /**
+     * Value returned by the operation
+     *
+     * @return Result, or null if the operation failed
+     */
+    public T getResult() {
+        return result;
+    }
+
+    /**
+     * Error the operation failed with. A {@link java.util.concurrent.TimeoutException} if the array didn't answer
+     * in time.
+     *
+     * @return Error, or null if the operation succeeded
+     */
+    public Throwable getError() {
+        return error;
+    }
+
+    /**
+     * Check if the operation succeeded
+     *
+     * @return True if the operation succeeded
+     */
+    public boolean isSuccessful() {
+        return error == null;
+    }
+}
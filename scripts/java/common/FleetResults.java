@@ -0,0 +1,71 @@
+package {{invokerPackage}};
+
+import java.io.Closeable;
+import java.util.Iterator;
+import java.util.List;
+import java.util.NoSuchElementException;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.CancellationException;
+
+/**
+ * Results of a {@link FleetOperation} run on every array of a {@link FleetClient}, in the order the arrays answer.
+ *
+ * Getting the next result blocks until another array answers. Each array has the full timeout of the operation from
+ * the moment its operation starts running. Arrays that haven't answered by then are returned with a
+ * {@link java.util.concurrent.TimeoutException}, and their operations are stopped. Closing the results stops the
+ * operations still running or waiting, which are then returned with a {@link CancellationException}.
+ *
+ * @param <T> Type of the result of the operation
+ */
+public class FleetResults<T> implements Iterator<FleetResult<T>>, Iterable<FleetResult<T>>, Closeable {
+    private final BlockingQueue<FleetResult<T>> results;
+    private final List<FleetTask<T>> tasks;
+    private int remaining;
+
+    FleetResults(BlockingQueue<FleetResult<T>> results, List<FleetTask<T>> tasks) {
+        this.results = results;
+        this.tasks = tasks;
+        this.remaining = tasks.size();
+    }
+
+    @Override
+    public Iterator<FleetResult<T>> iterator() {
+        return this;
+    }
+
+    @Override
+    public boolean hasNext() {
+        return remaining > 0;
+    }
+
+    @Override
+    public FleetResult<T> next() {
+        if (remaining == 0) {
+            throw new NoSuchElementException();
+        }
+
+        FleetResult<T> result;
+        try {
+            result = results.take();
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            // Every task has a result once closed
+            close();
+            result = results.poll();
+        }
+        remaining--;
+        return result;
+    }
+
+    @Override
+    public void remove() {
+        throw new UnsupportedOperationException();
+    }
+
+    @Override
+    public void close() {
+        for (FleetTask<T> task : tasks) {
+            task.abort(new CancellationException("Fleet results closed"));
+        }
+    }
+}
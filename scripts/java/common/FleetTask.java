@@ -0,0 +1,230 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.Interceptor;
+import com.squareup.okhttp.MediaType;
+import com.squareup.okhttp.Response;
+import com.squareup.okhttp.ResponseBody;
+
+import java.io.IOException;
+import java.io.InterruptedIOException;
+import java.net.Socket;
+import java.util.Set;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.RejectedExecutionException;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ScheduledFuture;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.TimeoutException;
+import java.util.concurrent.atomic.AtomicBoolean;
+
+import okio.Buffer;
+import okio.BufferedSource;
+import okio.ForwardingSource;
+import okio.Okio;
+
+/**
+ * Run of a {@link FleetOperation} on one array.
+ *
+ * The timeout of the array starts when the operation starts running, not while it waits for a thread. When it expires,
+ * or the task is aborted, the result is reported right away and the socket of the exchange in progress is closed, so
+ * the thread is released even if it is blocked reading a response. Once a response has been read, its connection may
+ * be reused by other operations through the fleet's connection pool, so it is no longer closed.
+ */
+class FleetTask<T> implements Runnable {
+    private static final ThreadLocal<FleetTask<?>> CURRENT = new ThreadLocal<FleetTask<?>>();
+
+    /**
+     * Network interceptor recording the socket used by the task running on the current thread until the response has
+     * been read, so it can be closed when the task is aborted
+     */
+    static final Interceptor SOCKET_TRACKER = new Interceptor() {
+        @Override
+        public Response intercept(Chain chain) throws IOException {
+            FleetTask<?> task = CURRENT.get();
+            if (task == null) {
+                return chain.proceed(chain.request());
+            }
+
+            Socket socket = chain.connection().getSocket();
+            task.attach(socket);
+            Response response;
+            try {
+                response = chain.proceed(chain.request());
+            } catch (IOException | RuntimeException e) {
+                task.detach(socket);
+                throw e;
+            }
+            if (response.body() == null) {
+                task.detach(socket);
+                return response;
+            }
+            return response.newBuilder().body(new ExchangeBody(response.body(), task, socket)).build();
+        }
+    };
+
+    private final String array;
+    private final ApiClient apiClient;
+    private final FleetOperation<T> operation;
+    private final long timeoutNanos;
+    private final ScheduledExecutorService timer;
+    private final BlockingQueue<FleetResult<T>> results;
+    private final Set<FleetTask<?>> activeTasks;
+    private final AtomicBoolean completed = new AtomicBoolean();
+    private Thread thread;
+    private Socket socket;
+
+    FleetTask(String array, ApiClient apiClient, FleetOperation<T> operation, long timeoutNanos,
+              ScheduledExecutorService timer, BlockingQueue<FleetResult<T>> results, Set<FleetTask<?>> activeTasks) {
+        this.array = array;
+        this.apiClient = apiClient;
+        this.operation = operation;
+        this.timeoutNanos = timeoutNanos;
+        this.timer = timer;
+        this.results = results;
+        this.activeTasks = activeTasks;
+    }
+
+    @Override
+    public void run() {
+        if (completed.get()) {
+            return;
+        }
+
+        ScheduledFuture<?> timeout;
+        try {
+            timeout = timer.schedule(new Runnable() {
+                @Override
+                public void run() {
+                    abort(new TimeoutException("Array " + array + " did not answer in time"));
+                }
+            }, timeoutNanos, TimeUnit.NANOSECONDS);
+        } catch (RejectedExecutionException e) {
+            abort(e);
+            return;
+        }
+
+        synchronized (this) {
+            thread = Thread.currentThread();
+        }
+        CURRENT.set(this);
+        try {
+            complete(new FleetResult<T>(array, operation.call(apiClient), null));
+        } catch (Throwable t) {
+            complete(new FleetResult<T>(array, null, t));
+        } finally {
+            CURRENT.remove();
+            timeout.cancel(false);
+            synchronized (this) {
+                thread = null;
+                socket = null;
+            }
+        }
+    }
+
+    /**
+     * Report the array as failed with the given error if it hasn't answered yet, and stop its operation
+     *
+     * @param error Error to report
+     */
+    void abort(Throwable error) {
+        if (!complete(new FleetResult<T>(array, null, error))) {
+            return;
+        }
+        synchronized (this) {
+            if (socket != null) {
+                try {
+                    socket.close();
+                } catch (IOException e) {
+                    // The operation fails either way
+                }
+            }
+            if (thread != null) {
+                thread.interrupt();
+            }
+        }
+    }
+
+    private synchronized void attach(Socket socket) throws InterruptedIOException {
+        if (completed.get()) {
+            throw new InterruptedIOException("Operation on array " + array + " was aborted");
+        }
+        this.socket = socket;
+    }
+
+    private synchronized void detach(Socket socket) {
+        if (this.socket == socket) {
+            this.socket = null;
+        }
+    }
+
+    private boolean complete(FleetResult<T> result) {
+        if (!completed.compareAndSet(false, true)) {
+            return false;
+        }
+        activeTasks.remove(this);
+        results.add(result);
+        return true;
+    }
+
+    /**
+     * Response body detaching its socket from the task once it has been read or closed, since the connection then goes
+     * back to the pool
+     */
+    private static class ExchangeBody extends ResponseBody {
+        private final ResponseBody delegate;
+        private final FleetTask<?> task;
+        private final Socket socket;
+        private BufferedSource source;
+
+        ExchangeBody(ResponseBody delegate, FleetTask<?> task, Socket socket) {
+            this.delegate = delegate;
+            this.task = task;
+            this.socket = socket;
+        }
+
+        @Override
+        public MediaType contentType() {
+            return delegate.contentType();
+        }
+
+        @Override
+        public long contentLength() throws IOException {
+            return delegate.contentLength();
+        }
+
+        @Override
+        public BufferedSource source() throws IOException {
+            if (source == null) {
+                source = Okio.buffer(new ForwardingSource(delegate.source()) {
+                    @Override
+                    public long read(Buffer sink, long byteCount) throws IOException {
+                        long read;
+                        try {
+                            read = super.read(sink, byteCount);
+                        } catch (IOException e) {
+                            task.detach(socket);
+                            throw e;
+                        }
+                        if (read == -1) {
+                            task.detach(socket);
+                        }
+                        return read;
+                    }
+
+                    @Override
+                    public void close() throws IOException {
+                        task.detach(socket);
+                        super.close();
+                    }
+                });
+            }
+            return source;
+        }
+
+        @Override
+        public void close() throws IOException {
+            task.detach(socket);
+            delegate.close();
+        }
+    }
+}
@@ -0,0 +1,73 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.Interceptor;
+import com.squareup.okhttp.Request;
+import com.squareup.okhttp.Response;
+
+import java.io.IOException;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ConcurrentMap;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Interceptor limiting the rate of requests sent to each host with a token bucket.
+ *
+ * Each host gets its own bucket, holding up to the burst size of tokens and refilled at the configured rate. Every
+ * request sent, retries included, takes a token, waiting for one if the bucket is empty. A limiter can be shared by
+ * several clients to limit their combined rate.
+ */
+public class HostRateLimiter implements Interceptor {
+    private final double permitsPerNano;
+    private final int burst;
+    private final ConcurrentMap<String, Bucket> buckets = new ConcurrentHashMap<String, Bucket>();
+
+    /**
+     * @param permitsPerSecond Number of requests allowed per second for each host
+     * @param burst Number of requests that can be sent at once to an idle host
+     */
+    public HostRateLimiter(double permitsPerSecond, int burst) {
+        if (permitsPerSecond <= 0 || burst < 1) {
+            throw new IllegalArgumentException("permitsPerSecond must be positive and burst at least 1");
+        }
+        this.permitsPerNano = permitsPerSecond / TimeUnit.SECONDS.toNanos(1);
+        this.burst = burst;
+    }
+
+    @Override
+    public Response intercept(Chain chain) throws IOException {
+        Request request = chain.request();
+        String host = request.httpUrl().host();
+        Bucket bucket = buckets.get(host);
+        if (bucket == null) {
+            Bucket newBucket = new Bucket();
+            bucket = buckets.putIfAbsent(host, newBucket);
+            if (bucket == null) {
+                bucket = newBucket;
+            }
+        }
+
+        long waitNanos = bucket.reserve();
+        if (waitNanos > 0) {
+            RetryInterceptor.sleep(TimeUnit.NANOSECONDS.toMillis(waitNanos) + 1);
+        }
+        return chain.proceed(request);
+    }
+
+    private class Bucket {
+        private double tokens = burst;
+        private long lastRefillNanos = System.nanoTime();
+
+        /**
+         * Take a token, letting the bucket go into debt so waiting requests are served in order
+         *
+         * @return Nanoseconds to wait before the token is available
+         */
+        synchronized long reserve() {
+            long now = System.nanoTime();
+            tokens = Math.min(burst, tokens + (now - lastRefillNanos) * permitsPerNano);
+            lastRefillNanos = now;
+            tokens -= 1;
+            return tokens >= 0 ? 0 : (long) (-tokens / permitsPerNano);
+        }
+    }
+}
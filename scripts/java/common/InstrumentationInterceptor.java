@@ -0,0 +1,125 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.Interceptor;
+import com.squareup.okhttp.MediaType;
+import com.squareup.okhttp.Request;
+import com.squareup.okhttp.Response;
+import com.squareup.okhttp.ResponseBody;
+
+import java.io.IOException;
+
+import okio.Buffer;
+import okio.BufferedSource;
+import okio.ForwardingSource;
+import okio.Okio;
+
+/**
+ * Interceptor measuring every call and reporting it to an {@link InstrumentationListener}.
+ *
+ * It must be installed as the first application interceptor of the client. The metrics of the call are put in the
+ * request tag, where the {@link RetryInterceptor} counts its retries.
+ */
+public class InstrumentationInterceptor implements Interceptor {
+    private final InstrumentationListener listener;
+
+    public InstrumentationInterceptor(InstrumentationListener listener) {
+        this.listener = listener;
+    }
+
+    @Override
+    public Response intercept(Chain chain) throws IOException {
+        Request request = chain.request();
+        Object operation = request.tag();
+        long requestBytes = request.body() == null ? 0 : request.body().contentLength();
+        ApiCallMetrics metrics = new ApiCallMetrics(operation instanceof String ? (String) operation : null,
+            request.method(), request.httpUrl().host(), requestBytes);
+
+        Response response;
+        try {
+            response = chain.proceed(request.newBuilder().tag(metrics).build());
+        } catch (IOException e) {
+            reportFailure(metrics, e);
+            throw e;
+        }
+
+        metrics.statusCode = response.code();
+        if (response.body() == null) {
+            reportResponse(metrics);
+            return response;
+        }
+        return response.newBuilder().body(new MeasuredResponseBody(response.body(), metrics)).build();
+    }
+
+    private void reportResponse(ApiCallMetrics metrics) {
+        if (metrics.complete()) {
+            listener.onResponse(metrics);
+        }
+    }
+
+    private void reportFailure(ApiCallMetrics metrics, IOException e) {
+        if (metrics.complete()) {
+            listener.onFailure(metrics, e);
+        }
+    }
+
+    /**
+     * Response body counting the bytes read, and reporting the call once it has been read or closed
+     */
+    private class MeasuredResponseBody extends ResponseBody {
+        private final ResponseBody delegate;
+        private final ApiCallMetrics metrics;
+        private BufferedSource source;
+
+        MeasuredResponseBody(ResponseBody delegate, ApiCallMetrics metrics) {
+            this.delegate = delegate;
+            this.metrics = metrics;
+        }
+
+        @Override
+        public MediaType contentType() {
+            return delegate.contentType();
+        }
+
+        @Override
+        public long contentLength() throws IOException {
+            return delegate.contentLength();
+        }
+
+        @Override
+        public BufferedSource source() throws IOException {
+            if (source == null) {
+                source = Okio.buffer(new ForwardingSource(delegate.source()) {
+                    @Override
+                    public long read(Buffer sink, long byteCount) throws IOException {
+                        long read;
+                        try {
+                            read = super.read(sink, byteCount);
+                        } catch (IOException e) {
+                            reportFailure(metrics, e);
+                            throw e;
+                        }
+                        if (read == -1) {
+                            reportResponse(metrics);
+                        } else {
+                            metrics.responseBytes += read;
+                        }
+                        return read;
+                    }
+
+                    @Override
+                    public void close() throws IOException {
+                        super.close();
+                        reportResponse(metrics);
+                    }
+                });
+            }
+            return source;
+        }
+
+        @Override
+        public void close() throws IOException {
+            delegate.close();
+            reportResponse(metrics);
+        }
+    }
+}
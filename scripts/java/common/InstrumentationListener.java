@@ -0,0 +1,26 @@
+package {{invokerPackage}};
+
+import java.io.IOException;
+
+/**
+ * Receives the metrics of every API call made by an {@link ApiClient} it is registered with through
+ * {@link ApiClient#setInstrumentationListener(InstrumentationListener)}.
+ *
+ * Callbacks run on the thread executing the call, so implementations should be thread safe and return quickly.
+ */
+public interface InstrumentationListener {
+    /**
+     * Called once the response of a call has been read, whatever its HTTP status.
+     *
+     * @param metrics Metrics of the call
+     */
+    void onResponse(ApiCallMetrics metrics);
+
+    /**
+     * Called when a call fails without a response, or while reading it.
+     *
+     * @param metrics Metrics of the call, with a status code of -1 if no response was received
+     * @param e Failure of the call
+     */
+    void onFailure(ApiCallMetrics metrics, IOException e);
+}
@@ -0,0 +1,12 @@
+package {{invokerPackage}};
+
+import com.google.gson.TypeAdapterFactory;
+
+/**
+ * Service published by each version of the SDK, providing the streaming adapters of its models.
+ *
+ * Only factories published under this interface are registered by {@link JSON}, so other libraries publishing Gson
+ * factories can't change how the SDK reads and writes its models.
+ */
+public interface ModelTypeAdapters extends TypeAdapterFactory {
+}
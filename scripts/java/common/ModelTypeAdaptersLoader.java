@@ -0,0 +1,40 @@
+package {{invokerPackage}};
+
+import com.google.gson.GsonBuilder;
+
+import java.util.Iterator;
+import java.util.ServiceConfigurationError;
+import java.util.ServiceLoader;
+
+/**
+ * Registers the {@link ModelTypeAdapters} published on the classpath.
+ */
+public final class ModelTypeAdaptersLoader {
+    private ModelTypeAdaptersLoader() {
+    }
+
+    /**
+     * Register every {@link ModelTypeAdapters} that can be loaded. Models of a version whose factory fails to load
+     * keep using Gson's reflective adapters.
+     *
+     * @param builder Builder of the SDK's Gson
+     */
+    public static void registerAll(GsonBuilder builder) {
+        Iterator<ModelTypeAdapters> factories = ServiceLoader.load(ModelTypeAdapters.class).iterator();
+        while (true) {
+            try {
+                if (!factories.hasNext()) {
+                    return;
+                }
+            } catch (ServiceConfigurationError e) {
+                // A service configuration file can't be read, stop looking for more
+                return;
+            }
+            try {
+                builder.registerTypeAdapterFactory(factories.next());
+            } catch (ServiceConfigurationError e) {
+                // This factory can't be loaded, carry on with the others
+            }
+        }
+    }
+}
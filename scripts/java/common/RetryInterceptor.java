@@ -0,0 +1,63 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.Interceptor;
+import com.squareup.okhttp.Request;
+import com.squareup.okhttp.Response;
+
+import java.io.IOException;
+import java.io.InterruptedIOException;
+
+/**
+ * Interceptor retrying calls according to a {@link RetryPolicy}.
+ */
+public class RetryInterceptor implements Interceptor {
+    private final RetryPolicy policy;
+
+    public RetryInterceptor(RetryPolicy policy) {
+        this.policy = policy;
+    }
+
+    /**
+     * Policy applied by this interceptor
+     *
+     * @return Retry policy
+     */
+    public RetryPolicy getPolicy() {
+        return policy;
+    }
+
+    @Override
+    public Response intercept(Chain chain) throws IOException {
+        Request request = chain.request();
+        if (!policy.isRetryable(request.method())) {
+            return chain.proceed(request);
+        }
+
+        for (int retry = 0; ; retry++) {
+            Response response = chain.proceed(request);
+            if (retry >= policy.getMaxRetries() || !policy.isRetryableStatus(response.code())) {
+                return response;
+            }
+            long delay = policy.getDelayMillis(retry, response.header("Retry-After"));
+            if (delay < 0) {
+                return response;
+            }
+            if (response.body() != null) {
+                response.body().close();
+            }
+            sleep(delay);
+            if (request.tag() instanceof ApiCallMetrics) {
+                ((ApiCallMetrics) request.tag()).retries++;
+            }
+        }
+    }
+
+    static void sleep(long millis) throws InterruptedIOException {
+        try {
+            Thread.sleep(millis);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new InterruptedIOException("Interrupted while waiting to retry");
+        }
+    }
+}
@@ -0,0 +1,233 @@
+package {{invokerPackage}};
+
+import java.text.ParseException;
+import java.text.SimpleDateFormat;
+import java.util.Arrays;
+import java.util.Collection;
+import java.util.Date;
+import java.util.HashSet;
+import java.util.Locale;
+import java.util.Set;
+import java.util.concurrent.ThreadLocalRandom;
+
+/**
+ * Policy deciding which calls {@link RetryInterceptor} retries, and how long it waits before each retry.
+ *
+ * Only requests with an idempotent method are retried, when the response has one of the retryable status codes.
+ * The delay before each retry is the one asked for by the Retry-After header of the response. Without it, the delay
+ * is a random value between zero and an exponentially growing backoff.
+ */
+public class RetryPolicy {
+    private int maxRetries = 3;
+    private long initialBackoffMillis = 500;
+    private long maxBackoffMillis = 30000;
+    private double backoffMultiplier = 2;
+    private long maxRetryAfterMillis = 60000;
+    private Set<Integer> retryableStatusCodes = new HashSet<Integer>(Arrays.asList(429, 503));
+    private Set<String> idempotentMethods = new HashSet<String>(Arrays.asList("GET", "HEAD", "OPTIONS", "PUT", "DELETE"));
+
+    /**
+     * Maximum number of retries of a call
+     *
+     * @return Maximum retries
+     */
+    public int getMaxRetries() {
+        return maxRetries;
+    }
+
+    /**
+     * Set the maximum number of retries of a call
+     *
+     * @param maxRetries Maximum retries
+     * @return Retry policy
+     */
+    public RetryPolicy setMaxRetries(int maxRetries) {
+        this.maxRetries = maxRetries;
+        return this;
+    }
+
+    /**
+     * Upper bound of the delay before the first retry
+     *
+     * @return Backoff in milliseconds
+     */
+    public long getInitialBackoffMillis() {
+        return initialBackoffMillis;
+    }
+
+    /**
+     * Set the upper bound of the delay before the first retry
+     *
+     * @param initialBackoffMillis Backoff in milliseconds
+     * @return Retry policy
+     */
+    public RetryPolicy setInitialBackoffMillis(long initialBackoffMillis) {
+        this.initialBackoffMillis = initialBackoffMillis;
+        return this;
+    }
+
+    /**
+     * Upper bound of the delay before any retry without a Retry-After header
+     *
+     * @return Backoff in milliseconds
+     */
+    public long getMaxBackoffMillis() {
+        return maxBackoffMillis;
+    }
+
+    /**
+     * Set the upper bound of the delay before any retry without a Retry-After header
+     *
+     * @param maxBackoffMillis Backoff in milliseconds
+     * @return Retry policy
+     */
+    public RetryPolicy setMaxBackoffMillis(long maxBackoffMillis) {
+        this.maxBackoffMillis = maxBackoffMillis;
+        return this;
+    }
+
+    /**
+     * Factor the backoff grows by after each retry
+     *
+     * @return Backoff multiplier
+     */
+    public double getBackoffMultiplier() {
+        return backoffMultiplier;
+    }
+
+    /**
+     * Set the factor the backoff grows by after each retry
+     *
+     * @param backoffMultiplier Backoff multiplier
+     * @return Retry policy
+     */
+    public RetryPolicy setBackoffMultiplier(double backoffMultiplier) {
+        this.backoffMultiplier = backoffMultiplier;
+        return this;
+    }
+
+    /**
+     * Longest Retry-After delay waited for. Responses asking for a longer delay are returned without retrying.
+     *
+     * @return Delay in milliseconds
+     */
+    public long getMaxRetryAfterMillis() {
+        return maxRetryAfterMillis;
+    }
+
+    /**
+     * Set the longest Retry-After delay waited for
+     *
+     * @param maxRetryAfterMillis Delay in milliseconds
+     * @return Retry policy
+     */
+    public RetryPolicy setMaxRetryAfterMillis(long maxRetryAfterMillis) {
+        this.maxRetryAfterMillis = maxRetryAfterMillis;
+        return this;
+    }
+
+    /**
+     * HTTP status codes of the responses that are retried
+     *
+     * @return Status codes
+     */
+    public Set<Integer> getRetryableStatusCodes() {
+        return retryableStatusCodes;
+    }
+
+    /**
+     * Set the HTTP status codes of the responses that are retried
+     *
+     * @param retryableStatusCodes Status codes
+     * @return Retry policy
+     */
+    public RetryPolicy setRetryableStatusCodes(Collection<Integer> retryableStatusCodes) {
+        this.retryableStatusCodes = new HashSet<Integer>(retryableStatusCodes);
+        return this;
+    }
+
+    /**
+     * HTTP methods of the requests that are retried
+     *
+     * @return HTTP methods
+     */
+    public Set<String> getIdempotentMethods() {
+        return idempotentMethods;
+    }
+
+    /**
+     * Set the HTTP methods of the requests that are retried
+     *
+     * @param idempotentMethods HTTP methods
+     * @return Retry policy
+     */
+    public RetryPolicy setIdempotentMethods(Collection<String> idempotentMethods) {
+        this.idempotentMethods = new HashSet<String>(idempotentMethods);
+        return this;
+    }
+
+    /**
+     * Check if a request may be retried
+     *
+     * @param method HTTP method of the request
+     * @return True if the request may be retried
+     */
+    public boolean isRetryable(String method) {
+        return maxRetries > 0 && idempotentMethods.contains(method);
+    }
+
+    /**
+     * Check if a response should be retried
+     *
+     * @param statusCode HTTP status code of the response
+     * @return True if the response should be retried
+     */
+    public boolean isRetryableStatus(int statusCode) {
+        return retryableStatusCodes.contains(statusCode);
+    }
+
+    /**
+     * Get the delay before a retry
+     *
+     * @param retry Number of retries already made
+     * @param retryAfter Value of the Retry-After header of the response, or null
+     * @return Delay in milliseconds, or -1 if the response asks for a longer delay than the policy allows
+     */
+    public long getDelayMillis(int retry, String retryAfter) {
+        if (retryAfter != null) {
+            long retryAfterMillis = parseRetryAfter(retryAfter);
+            if (retryAfterMillis >= 0) {
+                return retryAfterMillis > maxRetryAfterMillis ? -1 : retryAfterMillis;
+            }
+        }
+        double backoff = Math.min(maxBackoffMillis, initialBackoffMillis * Math.pow(backoffMultiplier, retry));
+        return (long) (ThreadLocalRandom.current().nextDouble() * backoff);
+    }
+
+    /**
+     * Parse a Retry-After header, given either as a number of seconds or as an HTTP date
+     *
+     * @param retryAfter Value of the header
+     * @return Delay in milliseconds, Long.MAX_VALUE if it is too long to be represented, or -1 if the header can't be
+     * parsed
+     */
+    private static long parseRetryAfter(String retryAfter) {
+        retryAfter = retryAfter.trim();
+        if (retryAfter.matches("[0-9]+")) {
+            try {
+                long seconds = Long.parseLong(retryAfter);
+                return seconds > Long.MAX_VALUE / 1000 ? Long.MAX_VALUE : seconds * 1000;
+            } catch (NumberFormatException e) {
+                // More digits than a long can hold
+                return Long.MAX_VALUE;
+            }
+        }
+        try {
+            SimpleDateFormat format = new SimpleDateFormat("EEE, dd MMM yyyy HH:mm:ss zzz", Locale.US);
+            Date date = format.parse(retryAfter);
+            return Math.max(date.getTime() - System.currentTimeMillis(), 0);
+        } catch (ParseException e) {
+            return -1;
+        }
+    }
+}
@@ -0,0 +1,206 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.Request;
+import com.squareup.okhttp.Response;
+
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.TimeoutException;
+
+import org.junit.After;
+import org.junit.Test;
+
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertFalse;
+import static org.junit.Assert.assertNull;
+import static org.junit.Assert.assertTrue;
+
+public class FleetClientTest {
+    private static final FleetOperation<Integer> GET_VOLUMES = new FleetOperation<Integer>() {
+        @Override
+        public Integer call(ApiClient apiClient) throws Exception {
+            Request request = new Request.Builder().url(apiClient.getBasePath() + "/api/volumes").build();
+            Response response = apiClient.getHttpClient().newCall(request).execute();
+            response.body().close();
+            if (!response.isSuccessful()) {
+                throw new IOException("HTTP " + response.code());
+            }
+            return response.code();
+        }
+    };
+
+    private final List<StubServer> servers = new ArrayList<StubServer>();
+    private FleetClient fleet;
+
+    @After
+    public void tearDown() {
+        if (fleet != null) {
+            fleet.close();
+        }
+        for (StubServer server : servers) {
+            server.close();
+        }
+    }
+
+    private StubServer addArray(String name) throws IOException {
+        StubServer server = new StubServer();
+        servers.add(server);
+        fleet.addArray(name, server.url());
+        return server;
+    }
+
+    private List<FleetResult<Integer>> execute(long timeoutMillis) {
+        List<FleetResult<Integer>> results = new ArrayList<FleetResult<Integer>>();
+        for (FleetResult<Integer> result : fleet.execute(GET_VOLUMES, timeoutMillis, TimeUnit.MILLISECONDS)) {
+            results.add(result);
+        }
+        return results;
+    }
+
+    private static Map<String, FleetResult<Integer>> byArray(List<FleetResult<Integer>> results) {
+        Map<String, FleetResult<Integer>> map = new HashMap<String, FleetResult<Integer>>();
+        for (FleetResult<Integer> result : results) {
+            map.put(result.getArray(), result);
+        }
+        return map;
+    }
+
+    private static long millisSince(long startNanos) {
+        return TimeUnit.NANOSECONDS.toMillis(System.nanoTime() - startNanos);
+    }
+
+    @Test
+    public void runsOnArraysConcurrently() throws IOException {
+        fleet = new FleetClient(4);
+        for (int i = 0; i < 4; i++) {
+            addArray("array" + i).enqueue(200, 300);
+        }
+
+        long start = System.nanoTime();
+        List<FleetResult<Integer>> results = execute(5000);
+
+        assertTrue(millisSince(start) < 1000);
+        assertEquals(4, results.size());
+        for (FleetResult<Integer> result : results) {
+            assertTrue(result.isSuccessful());
+            assertEquals(Integer.valueOf(200), result.getResult());
+        }
+    }
+
+    @Test
+    public void returnsResultsInCompletionOrder() throws IOException {
+        fleet = new FleetClient(3);
+        addArray("a").enqueue(200, 300);
+        addArray("b").enqueue(200, 50);
+        addArray("c").enqueue(200, 150);
+
+        List<FleetResult<Integer>> results = execute(5000);
+
+        assertEquals(3, results.size());
+        assertEquals("b", results.get(0).getArray());
+        assertEquals("c", results.get(1).getArray());
+        assertEquals("a", results.get(2).getArray());
+    }
+
+    @Test
+    public void timesOutSlowArray() throws IOException {
+        fleet = new FleetClient(3);
+        addArray("slow").enqueue(200, 5000);
+        addArray("fast1").enqueue(200, 0);
+        addArray("fast2").enqueue(200, 50);
+
+        long start = System.nanoTime();
+        Map<String, FleetResult<Integer>> results = byArray(execute(300));
+
+        assertTrue(millisSince(start) < 2000);
+        assertEquals(3, results.size());
+        assertFalse(results.get("slow").isSuccessful());
+        assertTrue(results.get("slow").getError() instanceof TimeoutException);
+        assertNull(results.get("slow").getResult());
+        assertTrue(results.get("fast1").isSuccessful());
+        assertTrue(results.get("fast2").isSuccessful());
+    }
+
+    @Test
+    public void reportsErrorsPerArray() throws IOException {
+        fleet = new FleetClient(3);
+        addArray("ok1");
+        addArray("failing").enqueue(500, 0);
+        addArray("ok2");
+
+        Map<String, FleetResult<Integer>> results = byArray(execute(5000));
+
+        assertEquals(3, results.size());
+        assertFalse(results.get("failing").isSuccessful());
+        assertTrue(results.get("failing").getError() instanceof IOException);
+        assertEquals("HTTP 500", results.get("failing").getError().getMessage());
+        assertTrue(results.get("ok1").isSuccessful());
+        assertTrue(results.get("ok2").isSuccessful());
+    }
+
+    @Test
+    public void startsTimeoutWhenOperationStarts() throws IOException {
+        // The last array only starts after the others, once the whole timeout would have expired if it were shared
+        fleet = new FleetClient(1);
+        addArray("a").enqueue(200, 200);
+        addArray("b").enqueue(200, 200);
+        addArray("c").enqueue(200, 200);
+
+        List<FleetResult<Integer>> results = execute(500);
+
+        assertEquals(3, results.size());
+        for (FleetResult<Integer> result : results) {
+            assertTrue(result.getArray(), result.isSuccessful());
+        }
+    }
+
+    @Test
+    public void releasesThreadOfTimedOutArray() throws IOException {
+        // The fast array can only run once the thread blocked on the slow array is released
+        fleet = new FleetClient(1);
+        addArray("slow").enqueue(200, 5000);
+        addArray("fast").enqueue(200, 0);
+
+        long start = System.nanoTime();
+        List<FleetResult<Integer>> results = execute(300);
+
+        assertTrue(millisSince(start) < 1500);
+        assertEquals(2, results.size());
+        assertEquals("slow", results.get(0).getArray());
+        assertTrue(results.get(0).getError() instanceof TimeoutException);
+        assertEquals("fast", results.get(1).getArray());
+        assertTrue(results.get(1).isSuccessful());
+    }
+
+    @Test
+    public void keepsPooledConnectionOfTimedOutOperation() throws Exception {
+        // The first operation times out after its call, while its pooled connection is used by a second execute
+        fleet = new FleetClient(2);
+        StubServer server = addArray("array");
+        server.enqueue(200, 0).enqueue(200, 400);
+
+        final CountDownLatch called = new CountDownLatch(1);
+        FleetResults<Integer> timedOut = fleet.execute(new FleetOperation<Integer>() {
+            @Override
+            public Integer call(ApiClient apiClient) throws Exception {
+                Integer status = GET_VOLUMES.call(apiClient);
+                called.countDown();
+                Thread.sleep(5000);
+                return status;
+            }
+        }, 200, TimeUnit.MILLISECONDS);
+        assertTrue(called.await(5, TimeUnit.SECONDS));
+        FleetResults<Integer> overlapping = fleet.execute(GET_VOLUMES, 5000, TimeUnit.MILLISECONDS);
+
+        assertTrue(timedOut.next().getError() instanceof TimeoutException);
+        FleetResult<Integer> result = overlapping.next();
+        assertTrue(result.isSuccessful());
+        // The second call was neither failed nor retried
+        assertEquals(2, server.getRequests().size());
+    }
+}
@@ -0,0 +1,99 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.Request;
+import com.squareup.okhttp.Response;
+
+import java.io.IOException;
+import java.util.List;
+
+import org.junit.After;
+import org.junit.Before;
+import org.junit.Test;
+
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertTrue;
+
+public class HostRateLimiterTest {
+    private StubServer server;
+    private ApiClient apiClient;
+
+    @Before
+    public void setUp() throws IOException {
+        server = new StubServer();
+        apiClient = new ApiClient();
+    }
+
+    @After
+    public void tearDown() {
+        server.close();
+    }
+
+    private void get(String host) throws IOException {
+        Request request = new Request.Builder().url(server.url(host) + "/api/volumes").build();
+        Response response = apiClient.getHttpClient().newCall(request).execute();
+        response.body().close();
+    }
+
+    @Test
+    public void spacesRequestsToAHost() throws IOException {
+        apiClient.setRateLimiter(new HostRateLimiter(10, 1));
+        for (int i = 0; i < 4; i++) {
+            get("127.0.0.1");
+        }
+
+        List<StubServer.RecordedRequest> requests = server.getRequests();
+        assertEquals(4, requests.size());
+        for (int i = 1; i < requests.size(); i++) {
+            assertTrue(requests.get(i).millisSince(requests.get(i - 1)) >= 90);
+        }
+    }
+
+    @Test
+    public void allowsBursts() throws IOException {
+        apiClient.setRateLimiter(new HostRateLimiter(1, 3));
+        for (int i = 0; i < 3; i++) {
+            get("127.0.0.1");
+        }
+
+        List<StubServer.RecordedRequest> requests = server.getRequests();
+        assertTrue(requests.get(2).millisSince(requests.get(0)) < 500);
+    }
+
+    @Test
+    public void limitsEachHostSeparately() throws IOException {
+        apiClient.setRateLimiter(new HostRateLimiter(1, 1));
+        get("127.0.0.1");
+        get("localhost");
+
+        List<StubServer.RecordedRequest> requests = server.getRequests();
+        assertEquals(2, requests.size());
+        assertTrue(requests.get(1).millisSince(requests.get(0)) < 500);
+    }
+
+    @Test
+    public void sharedLimiterLimitsClientsTogether() throws IOException {
+        HostRateLimiter rateLimiter = new HostRateLimiter(5, 1);
+        apiClient.setRateLimiter(rateLimiter);
+        ApiClient otherClient = new ApiClient().setRateLimiter(rateLimiter);
+
+        get("127.0.0.1");
+        Request request = new Request.Builder().url(server.url() + "/api/volumes").build();
+        otherClient.getHttpClient().newCall(request).execute().body().close();
+
+        List<StubServer.RecordedRequest> requests = server.getRequests();
+        assertEquals(2, requests.size());
+        assertTrue(requests.get(1).millisSince(requests.get(0)) >= 190);
+    }
+
+    @Test
+    public void retriesTakeATokenEach() throws IOException {
+        apiClient.setRetryPolicy(new RetryPolicy().setInitialBackoffMillis(0));
+        apiClient.setRateLimiter(new HostRateLimiter(10, 1));
+        server.enqueue(503, 0).enqueue(200, 0);
+        get("127.0.0.1");
+
+        List<StubServer.RecordedRequest> requests = server.getRequests();
+        assertEquals(2, requests.size());
+        assertTrue(requests.get(1).millisSince(requests.get(0)) >= 90);
+    }
+}
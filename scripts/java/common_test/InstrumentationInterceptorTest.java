@@ -0,0 +1,172 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.Call;
+import com.squareup.okhttp.Interceptor;
+import com.squareup.okhttp.MediaType;
+import com.squareup.okhttp.Request;
+import com.squareup.okhttp.RequestBody;
+import com.squareup.okhttp.Response;
+
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.junit.After;
+import org.junit.Before;
+import org.junit.Test;
+
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertFalse;
+import static org.junit.Assert.assertNull;
+import static org.junit.Assert.assertTrue;
+import static org.junit.Assert.fail;
+
+public class InstrumentationInterceptorTest {
+    private StubServer server;
+    private ApiClient apiClient;
+    private RecordingListener listener;
+
+    @Before
+    public void setUp() throws IOException {
+        server = new StubServer();
+        listener = new RecordingListener();
+        apiClient = new ApiClient().setBasePath(server.url());
+        apiClient.setRetryPolicy(new RetryPolicy().setInitialBackoffMillis(10).setMaxBackoffMillis(50));
+        apiClient.setInstrumentationListener(listener);
+    }
+
+    @After
+    public void tearDown() {
+        server.close();
+    }
+
+    private Response send(Request.Builder builder) throws IOException {
+        return apiClient.getHttpClient().newCall(builder.url(server.url() + "/api/volumes").build()).execute();
+    }
+
+    @Test
+    public void reportsStatusAndSizes() throws IOException {
+        String json = "{\"name\":\"vol1\"}";
+        RequestBody body = RequestBody.create(MediaType.parse("application/json"), json);
+        Response response = send(new Request.Builder().post(body));
+        assertEquals("{}", response.body().string());
+
+        assertEquals(1, listener.responses.size());
+        ApiCallMetrics metrics = listener.responses.get(0);
+        assertEquals(200, metrics.getStatusCode());
+        assertEquals("POST", metrics.getMethod());
+        assertEquals("127.0.0.1", metrics.getHost());
+        assertEquals(json.length(), metrics.getRequestBytes());
+        assertEquals(json.length(), server.getRequests().get(0).getBodyBytes());
+        assertEquals(2, metrics.getResponseBytes());
+        assertEquals(0, metrics.getRetryCount());
+        assertTrue(metrics.getDurationNanos() > 0);
+        assertNull(metrics.getOperation());
+    }
+
+    @Test
+    public void reportsErrorStatusAsResponse() throws IOException {
+        server.enqueue(404, 0);
+
+        send(new Request.Builder()).body().close();
+
+        assertEquals(1, listener.responses.size());
+        assertEquals(404, listener.responses.get(0).getStatusCode());
+        assertTrue(listener.failures.isEmpty());
+    }
+
+    @Test
+    public void countsRetries() throws IOException {
+        server.enqueue(429, 0).enqueue(200, 0);
+
+        send(new Request.Builder()).body().close();
+
+        assertEquals(2, server.getRequests().size());
+        assertEquals(1, listener.responses.size());
+        assertEquals(200, listener.responses.get(0).getStatusCode());
+        assertEquals(1, listener.responses.get(0).getRetryCount());
+    }
+
+    @Test
+    public void reportsCallOnceWhenBodyIsReadAndClosed() throws IOException {
+        Response response = send(new Request.Builder());
+        // Reading to the end, then closing the source and the body, each completes the call
+        response.body().source().readUtf8();
+        response.body().source().close();
+        response.body().close();
+
+        assertEquals(1, listener.responses.size());
+        assertEquals(2, listener.responses.get(0).getResponseBytes());
+    }
+
+    @Test
+    public void reportsCallWhenBodyIsClosedUnread() throws IOException {
+        send(new Request.Builder()).body().close();
+
+        assertEquals(1, listener.responses.size());
+        assertEquals(0, listener.responses.get(0).getResponseBytes());
+    }
+
+    @Test
+    public void reportsConnectionFailure() throws IOException {
+        StubServer closedServer = new StubServer();
+        String url = closedServer.url();
+        closedServer.close();
+
+        try {
+            apiClient.getHttpClient().newCall(new Request.Builder().url(url + "/api/volumes").build()).execute();
+            fail("Expected the connection to be refused");
+        } catch (IOException e) {
+            assertEquals(1, listener.failures.size());
+            assertEquals(e, listener.errors.get(0));
+        }
+        assertTrue(listener.responses.isEmpty());
+        assertEquals(-1, listener.failures.get(0).getStatusCode());
+    }
+
+    @Test
+    public void movesOperationNameToTag() throws Exception {
+        // Generated API calls may get their header params from the caller, so the map must not be changed
+        Map<String, String> headerParams = Collections.singletonMap(ApiClient.OPERATION_NAME_HEADER, "getVolumes");
+        Call call = apiClient.buildCall("/api/volumes", "GET", new ArrayList<Pair>(), new ArrayList<Pair>(), null,
+            headerParams, new HashMap<String, Object>(), new String[0], null);
+        call.execute().body().close();
+
+        assertEquals(1, listener.responses.size());
+        assertEquals("getVolumes", listener.responses.get(0).getOperation());
+        assertNull(server.getRequests().get(0).getHeader(ApiClient.OPERATION_NAME_HEADER));
+        assertEquals(1, headerParams.size());
+    }
+
+    @Test
+    public void removesInterceptorWithoutListener() throws IOException {
+        apiClient.setInstrumentationListener(null);
+
+        for (Interceptor interceptor : apiClient.getHttpClient().interceptors()) {
+            assertFalse(interceptor instanceof InstrumentationInterceptor);
+        }
+        send(new Request.Builder()).body().close();
+        assertTrue(listener.responses.isEmpty());
+        assertTrue(listener.failures.isEmpty());
+    }
+
+    private static class RecordingListener implements InstrumentationListener {
+        private final List<ApiCallMetrics> responses = Collections.synchronizedList(new ArrayList<ApiCallMetrics>());
+        private final List<ApiCallMetrics> failures = Collections.synchronizedList(new ArrayList<ApiCallMetrics>());
+        private final List<IOException> errors = Collections.synchronizedList(new ArrayList<IOException>());
+
+        @Override
+        public void onResponse(ApiCallMetrics metrics) {
+            responses.add(metrics);
+        }
+
+        @Override
+        public void onFailure(ApiCallMetrics metrics, IOException e) {
+            failures.add(metrics);
+            errors.add(e);
+        }
+    }
+}
@@ -0,0 +1,153 @@
+package {{invokerPackage}};
+
+import com.squareup.okhttp.MediaType;
+import com.squareup.okhttp.Request;
+import com.squareup.okhttp.RequestBody;
+import com.squareup.okhttp.Response;
+
+import java.io.IOException;
+import java.text.SimpleDateFormat;
+import java.util.Date;
+import java.util.List;
+import java.util.Locale;
+import java.util.TimeZone;
+
+import org.junit.After;
+import org.junit.Before;
+import org.junit.Test;
+
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertTrue;
+
+public class RetryInterceptorTest {
+    private StubServer server;
+    private ApiClient apiClient;
+
+    @Before
+    public void setUp() throws IOException {
+        server = new StubServer();
+        apiClient = new ApiClient();
+        apiClient.setRetryPolicy(new RetryPolicy().setInitialBackoffMillis(10).setMaxBackoffMillis(50));
+    }
+
+    @After
+    public void tearDown() {
+        server.close();
+    }
+
+    private Response send(String method) throws IOException {
+        RequestBody body = method.equals("GET") ? null : RequestBody.create(MediaType.parse("application/json"), "{}");
+        Request request = new Request.Builder().url(server.url() + "/api/volumes").method(method, body).build();
+        Response response = apiClient.getHttpClient().newCall(request).execute();
+        response.body().close();
+        return response;
+    }
+
+    @Test
+    public void retriesGetAfter429() throws IOException {
+        server.enqueue(429, 0).enqueue(200, 0);
+
+        assertEquals(200, send("GET").code());
+        assertEquals(2, server.getRequests().size());
+    }
+
+    @Test
+    public void retriesGetAfter503() throws IOException {
+        server.enqueue(503, 0).enqueue(503, 0).enqueue(200, 0);
+
+        assertEquals(200, send("GET").code());
+        assertEquals(3, server.getRequests().size());
+    }
+
+    @Test
+    public void doesNotRetryPost() throws IOException {
+        server.enqueue(503, 0);
+
+        assertEquals(503, send("POST").code());
+        assertEquals(1, server.getRequests().size());
+    }
+
+    @Test
+    public void doesNotRetryPatch() throws IOException {
+        server.enqueue(429, 0);
+
+        assertEquals(429, send("PATCH").code());
+        assertEquals(1, server.getRequests().size());
+    }
+
+    @Test
+    public void doesNotRetryOtherStatusCodes() throws IOException {
+        server.enqueue(500, 0);
+
+        assertEquals(500, send("GET").code());
+        assertEquals(1, server.getRequests().size());
+    }
+
+    @Test
+    public void stopsAfterMaxRetries() throws IOException {
+        apiClient.getRetryPolicy().setMaxRetries(2);
+        server.enqueue(503, 0).enqueue(503, 0).enqueue(503, 0).enqueue(200, 0);
+
+        assertEquals(503, send("GET").code());
+        assertEquals(3, server.getRequests().size());
+    }
+
+    @Test
+    public void waitsForRetryAfterSeconds() throws IOException {
+        server.enqueue(429, 0, "Retry-After", "1").enqueue(200, 0);
+
+        assertEquals(200, send("GET").code());
+        List<StubServer.RecordedRequest> requests = server.getRequests();
+        assertEquals(2, requests.size());
+        assertTrue(requests.get(1).millisSince(requests.get(0)) >= 950);
+    }
+
+    @Test
+    public void waitsForRetryAfterDate() throws IOException {
+        SimpleDateFormat format = new SimpleDateFormat("EEE, dd MMM yyyy HH:mm:ss zzz", Locale.US);
+        format.setTimeZone(TimeZone.getTimeZone("GMT"));
+        // The date has a precision of one second, so it is taken on a second boundary at least 2 seconds ahead
+        long retryAtMillis = (System.currentTimeMillis() / 1000 + 3) * 1000;
+        server.enqueue(503, 0, "Retry-After", format.format(new Date(retryAtMillis))).enqueue(200, 0);
+
+        assertEquals(200, send("GET").code());
+        assertEquals(2, server.getRequests().size());
+        // Allow for the resolution of the system clock
+        assertTrue(System.currentTimeMillis() >= retryAtMillis - 20);
+    }
+
+    @Test
+    public void doesNotRetryWhenRetryAfterIsTooLong() throws IOException {
+        apiClient.getRetryPolicy().setMaxRetryAfterMillis(60000);
+        server.enqueue(429, 0, "Retry-After", "120");
+
+        assertEquals(429, send("GET").code());
+        assertEquals(1, server.getRequests().size());
+    }
+
+    @Test
+    public void doesNotRetryWhenRetryAfterOverflows() throws IOException {
+        server.enqueue(429, 0, "Retry-After", "99999999999999999999");
+
+        assertEquals(429, send("GET").code());
+        assertEquals(1, server.getRequests().size());
+    }
+
+    @Test
+    public void retryAfterOverflowIsLongerThanAllowed() {
+        RetryPolicy policy = new RetryPolicy();
+        assertEquals(-1, policy.getDelayMillis(0, "9223372036854775807"));
+        assertEquals(-1, policy.getDelayMillis(0, "99999999999999999999"));
+        assertEquals(5000, policy.getDelayMillis(0, "5"));
+    }
+
+    @Test
+    public void backoffIsBoundedWithoutRetryAfter() {
+        RetryPolicy policy = new RetryPolicy().setInitialBackoffMillis(100).setMaxBackoffMillis(1000);
+        for (int retry = 0; retry < 10; retry++) {
+            long delay = policy.getDelayMillis(retry, null);
+            assertTrue(delay >= 0);
+            assertTrue(delay <= Math.min(1000, 100 * Math.pow(2, retry)));
+        }
+    }
+}
@@ -0,0 +1,196 @@
+package {{invokerPackage}};
+
+import com.sun.net.httpserver.Headers;
+import com.sun.net.httpserver.HttpExchange;
+import com.sun.net.httpserver.HttpHandler;
+import com.sun.net.httpserver.HttpServer;
+
+import java.io.Closeable;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.net.InetSocketAddress;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.List;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.LinkedBlockingQueue;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Local HTTP server answering with queued responses, and recording the requests it receives.
+ * Once the queue is empty, it answers 200 with an empty JSON object.
+ */
+public class StubServer implements Closeable {
+    private final HttpServer server;
+    private final ExecutorService executor = Executors.newCachedThreadPool();
+    private final BlockingQueue<StubResponse> responses = new LinkedBlockingQueue<StubResponse>();
+    private final List<RecordedRequest> requests = Collections.synchronizedList(new ArrayList<RecordedRequest>());
+
+    public StubServer() throws IOException {
+        server = HttpServer.create(new InetSocketAddress("127.0.0.1", 0), 0);
+        server.createContext("/", new HttpHandler() {
+            @Override
+            public void handle(HttpExchange exchange) throws IOException {
+                try {
+                    respond(exchange);
+                } catch (IOException e) {
+                    // The client gave up on the request
+                } finally {
+                    exchange.close();
+                }
+            }
+        });
+        server.setExecutor(executor);
+        server.start();
+    }
+
+    /**
+     * Base URL of the server, using the given host name
+     *
+     * @param host Host name resolving to the loopback address, such as 127.0.0.1 or localhost
+     * @return Base URL
+     */
+    public String url(String host) {
+        return "http://" + host + ":" + server.getAddress().getPort();
+    }
+
+    /**
+     * Base URL of the server
+     *
+     * @return Base URL
+     */
+    public String url() {
+        return url("127.0.0.1");
+    }
+
+    /**
+     * Queue a response
+     *
+     * @param status HTTP status code
+     * @param delayMillis Time to wait before answering
+     * @param headers Response headers, as alternating names and values
+     * @return Stub server
+     */
+    public StubServer enqueue(int status, long delayMillis, String... headers) {
+        responses.add(new StubResponse(status, delayMillis, headers));
+        return this;
+    }
+
+    /**
+     * Requests received so far, in order
+     *
+     * @return Recorded requests
+     */
+    public List<RecordedRequest> getRequests() {
+        synchronized (requests) {
+            return new ArrayList<RecordedRequest>(requests);
+        }
+    }
+
+    @Override
+    public void close() {
+        server.stop(0);
+        executor.shutdownNow();
+    }
+
+    private void respond(HttpExchange exchange) throws IOException {
+        long receivedNanos = System.nanoTime();
+        InputStream body = exchange.getRequestBody();
+        long bodyBytes = 0;
+        while (body.read() != -1) {
+            bodyBytes++;
+        }
+        Headers headers = new Headers();
+        headers.putAll(exchange.getRequestHeaders());
+        requests.add(new RecordedRequest(exchange.getRequestMethod(), headers, bodyBytes, receivedNanos));
+
+        StubResponse response = responses.poll();
+        if (response == null) {
+            response = new StubResponse(200, 0);
+        }
+        if (response.delayMillis > 0) {
+            try {
+                Thread.sleep(response.delayMillis);
+            } catch (InterruptedException e) {
+                return;
+            }
+        }
+        for (int i = 0; i + 1 < response.headers.length; i += 2) {
+            exchange.getResponseHeaders().add(response.headers[i], response.headers[i + 1]);
+        }
+        byte[] bytes = "{}".getBytes("UTF-8");
+        exchange.getResponseHeaders().add("Content-Type", "application/json");
+        exchange.sendResponseHeaders(response.status, bytes.length);
+        OutputStream out = exchange.getResponseBody();
+        out.write(bytes);
+        out.close();
+    }
+
+    private static class StubResponse {
+        private final int status;
+        private final long delayMillis;
+        private final String[] headers;
+
+        StubResponse(int status, long delayMillis, String... headers) {
+            this.status = status;
+            this.delayMillis = delayMillis;
+            this.headers = headers;
+        }
+    }
+
+    /**
+     * Request received by the server
+     */
+    public static class RecordedRequest {
+        private final String method;
+        private final Headers headers;
+        private final long bodyBytes;
+        private final long receivedNanos;
+
+        RecordedRequest(String method, Headers headers, long bodyBytes, long receivedNanos) {
+            this.method = method;
+            this.headers = headers;
+            this.bodyBytes = bodyBytes;
+            this.receivedNanos = receivedNanos;
+        }
+
+        public String getMethod() {
+            return method;
+        }
+
+        public String getHost() {
+            return headers.getFirst("Host");
+        }
+
+        /**
+         * First value of a request header
+         *
+         * @param name Header name, in any case
+         * @return Header value, or null if the header wasn't sent
+         */
+        public String getHeader(String name) {
+            return headers.getFirst(name);
+        }
+
+        public long getBodyBytes() {
+            return bodyBytes;
+        }
+
+        public long getReceivedNanos() {
+            return receivedNanos;
+        }
+
+        /**
+         * Time between another request and this one
+         *
+         * @param previous Earlier request
+         * @return Milliseconds elapsed
+         */
+        public long millisSince(RecordedRequest previous) {
+            return TimeUnit.NANOSECONDS.toMillis(receivedNanos - previous.receivedNanos);
+        }
+    }
+}
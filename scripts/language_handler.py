@@ -17,6 +17,54 @@ import json
 # shadow_nullable_varibles is a list of pairs of file_name to list of variables in file that require shadowing
 shadow_nullable_varibles = [("Qos", ["bandwidthLimit", "iopsLimit"])]
 
+# Java types the generated streaming adapters read directly from the JsonReader. Any other field type is delegated to
+# the adapter Gson resolves for it, which for other models is their own generated streaming adapter
+streaming_read_expressions = {
+    "String": "in.peek() == JsonToken.BOOLEAN ? Boolean.toString(in.nextBoolean()) : in.nextString()",
+    "Boolean": "in.peek() == JsonToken.STRING ? Boolean.parseBoolean(in.nextString()) : in.nextBoolean()",
+    "Integer": "in.nextInt()",
+    "Long": "in.nextLong()",
+    "Double": "in.nextDouble()",
+    "Float": "(float) in.nextDouble()",
+}
+
+# Types whose reads throw a NumberFormatException on out of range or non numeric values. Like Gson's own adapters, the
+# generated adapters wrap it in a JsonSyntaxException, which is what JSON.deserialize handles
+streaming_number_format_types = ["Integer", "Long"]
+
+streaming_adapter_imports = ["com.google.gson.Gson",
+                             "com.google.gson.JsonSyntaxException",
+                             "com.google.gson.TypeAdapter",
+                             "com.google.gson.reflect.TypeToken",
+                             "com.google.gson.stream.JsonReader",
+                             "com.google.gson.stream.JsonToken",
+                             "com.google.gson.stream.JsonWriter",
+                             "java.io.IOException"]
+
+type_adapter_factory_class = "ModelTypeAdapterFactory"
+
+# Java sources bundled with these scripts, added to the common classes with the invoker package filled in
+java_common_sources_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "java", "common")
+
+# Tests of the bundled Java sources, added to the project holding the common classes. They run against local stub
+# servers
+java_common_test_sources_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "java", "common_test")
+
+type_adapter_sources = ["ModelTypeAdapters", "ModelTypeAdaptersLoader"]
+
+instrumentation_sources = ["ApiCallMetrics", "InstrumentationInterceptor", "InstrumentationListener"]
+
+retry_sources = ["HostRateLimiter", "RetryInterceptor", "RetryPolicy"]
+
+fleet_sources = ["FleetClient", "FleetOperation", "FleetResult", "FleetResults", "FleetTask"]
+
+common_test_sources = ["StubServer", "InstrumentationInterceptorTest", "RetryInterceptorTest", "HostRateLimiterTest",
+                       "FleetClientTest"]
+
+# Pseudo header used by the generated API calls to pass their operation name to the ApiClient, which moves it to the
+# request tag before the headers are sent
+operation_name_header = "X-Operation-Name"
+
 def get_config_file(config_dir, version):
     return os.path.join(config_dir, f"config{version}.json")
 
@@ -64,6 +112,9 @@ class JavaHandler(LaunguageHandlerBase):
     def _get_model_package(self, version):
         return f"com.purestorage.rest.{self.product}.{self._get_version_for_package(version)}.model"
 
+    def _get_invoker_package(self):
+        return f"com.purestorage.rest.{self.product}.common"
+
     def _get_api_package(self, version):
         return f"com.purestorage.rest.{self.product}.{self._get_version_for_package(version)}.api"
 
@@ -201,7 +252,7 @@ class JavaHandler(LaunguageHandlerBase):
         for version in versions:
             config_dict = {
                 'groupId': "com.purestorage.rest",
-                'invokerPackage': f"com.purestorage.rest.{self.product}.common",
+                'invokerPackage': self._get_invoker_package(),
                 'modelPackage': self._get_model_package(version),
                 'apiPackage': self._get_api_package(version),
                 'artifactId': self._get_artifact_id(version),
@@ -272,6 +323,432 @@ class JavaHandler(LaunguageHandlerBase):
                 file.write(file_contents)
 
 
+    @staticmethod
+    def _build_streaming_adapter(class_name, fields):
+        """
+        Build the source of a nested TypeAdapter that reads and writes the given model without reflection.
+
+        :param class_name: name of the model class the adapter is nested in
+        :param fields: list of (json_name, java_type, variable) tuples for each serialized member of the model
+        :return: java source of the nested class
+        """
+        members = []
+        constructor = []
+        read_cases = []
+        writes = []
+        for json_name, java_type, variable in fields:
+            read_cases.append(f'          case "{json_name}":\n')
+            writes.append(f'      out.name("{json_name}");\n')
+            if java_type in streaming_number_format_types:
+                read_cases.append(f'            if (in.peek() == JsonToken.NULL) {{\n'
+                                  f'              in.nextNull();\n'
+                                  f'              instance.{variable} = null;\n'
+                                  f'            }} else {{\n'
+                                  f'              try {{\n'
+                                  f'                instance.{variable} = {streaming_read_expressions[java_type]};\n'
+                                  f'              }} catch (NumberFormatException e) {{\n'
+                                  f'                throw new JsonSyntaxException(e);\n'
+                                  f'              }}\n'
+                                  f'            }}\n')
+                writes.append(f'      out.value(value.{variable});\n')
+            elif java_type in streaming_read_expressions:
+                read_cases.append(f'            if (in.peek() == JsonToken.NULL) {{\n'
+                                  f'              in.nextNull();\n'
+                                  f'              instance.{variable} = null;\n'
+                                  f'            }} else {{\n'
+                                  f'              instance.{variable} = {streaming_read_expressions[java_type]};\n'
+                                  f'            }}\n')
+                writes.append(f'      out.value(value.{variable});\n')
+            elif java_type == 'Object':
+                # Shadow nullable variables hold either a Double, or an empty string once cleared
+                read_cases.append(f'            if (in.peek() == JsonToken.NULL) {{\n'
+                                  f'              in.nextNull();\n'
+                                  f'              instance.{variable} = null;\n'
+                                  f'            }} else if (in.peek() == JsonToken.NUMBER) {{\n'
+                                  f'              instance.{variable} = in.nextDouble();\n'
+                                  f'            }} else if (in.peek() == JsonToken.STRING) {{\n'
+                                  f'              instance.{variable} = in.nextString();\n'
+                                  f'            }} else {{\n'
+                                  f'              instance.{variable} = {variable}Adapter.read(in);\n'
+                                  f'            }}\n')
+                writes.append(f'      if (value.{variable} instanceof String) {{\n'
+                              f'        out.value((String) value.{variable});\n'
+                              f'      }} else if (value.{variable} instanceof Number) {{\n'
+                              f'        out.value((Number) value.{variable});\n'
+                              f'      }} else {{\n'
+                              f'        {variable}Adapter.write(out, value.{variable});\n'
+                              f'      }}\n')
+            else:
+                read_cases.append(f'            if (in.peek() == JsonToken.NULL) {{\n'
+                                  f'              in.nextNull();\n'
+                                  f'              instance.{variable} = null;\n'
+                                  f'            }} else {{\n'
+                                  f'              instance.{variable} = {variable}Adapter.read(in);\n'
+                                  f'            }}\n')
+                writes.append(f'      if (value.{variable} == null) {{\n'
+                              f'        out.nullValue();\n'
+                              f'      }} else {{\n'
+                              f'        {variable}Adapter.write(out, value.{variable});\n'
+                              f'      }}\n')
+
+            if java_type not in streaming_read_expressions:
+                if '<' in java_type:
+                    type_expression = f'new TypeToken<{java_type}>() {{}}'
+                else:
+                    type_expression = f'{java_type}.class'
+                members.append(f'    private final TypeAdapter<{java_type}> {variable}Adapter;\n')
+                constructor.append(f'      this.{variable}Adapter = gson.getAdapter({type_expression});\n')
+            read_cases.append('            break;\n')
+
+        return ('\n  /**\n'
+                f'   * Streaming Gson adapter for {class_name}, registered through {type_adapter_factory_class}\n'
+                '   */\n'
+                '  public static class StreamingAdapter extends TypeAdapter<' + class_name + '> {\n'
+                + ''.join(members) +
+                '\n    public StreamingAdapter(Gson gson) {\n'
+                + ''.join(constructor) +
+                '    }\n'
+                '\n    @Override\n'
+                f'    public void write(JsonWriter out, {class_name} value) throws IOException {{\n'
+                '      if (value == null) {\n'
+                '        out.nullValue();\n'
+                '        return;\n'
+                '      }\n'
+                '      out.beginObject();\n'
+                + ''.join(writes) +
+                '      out.endObject();\n'
+                '    }\n'
+                '\n    @Override\n'
+                f'    public {class_name} read(JsonReader in) throws IOException {{\n'
+                '      if (in.peek() == JsonToken.NULL) {\n'
+                '        in.nextNull();\n'
+                '        return null;\n'
+                '      }\n'
+                f'      {class_name} instance = new {class_name}();\n'
+                '      in.beginObject();\n'
+                '      while (in.hasNext()) {\n'
+                '        switch (in.nextName()) {\n'
+                + ''.join(read_cases) +
+                '          default:\n'
+                '            in.skipValue();\n'
+                '        }\n'
+                '      }\n'
+                '      in.endObject();\n'
+                '      return instance;\n'
+                '    }\n'
+                '  }\n')
+
+    def _generate_streaming_type_adapters(self, generator_output_dir, version):
+        """
+        Adds a streaming TypeAdapter to every model class, and a ModelTypeAdapters factory for the version's model
+        package which is published as a service so the JSON class can register it. Models the adapters can't handle are
+        left to Gson's reflective adapter.
+
+        :param generator_output_dir: directory containing the generator output for this version
+        :param version: version being generated
+        """
+        model_package = self._get_model_package(version)
+        model_dir = os.path.join(generator_output_dir, "src", "main", "java", *model_package.split('.'))
+
+        class_regex = r'^public class (\w+)\s*(extends\s[^{]+?)?\s*(?:implements\s[^{]+)?\{'
+        field_regex = r'@SerializedName\("([^"]+)"\)\s+(?:public|protected|private)\s([\w.<>, ?\[\]]+?)\s(\w+)\s*(?:=[^;]*)?;'
+
+        model_paths = sorted(glob.glob(os.path.join(model_dir, '*.java')))
+
+        # Gson prefers a declared type's own adapter to the reflective adapter of the runtime type, so an adapter for
+        # a parent class would drop the fields of its subclasses
+        extended_classes = set()
+        for path in model_paths:
+            with open(path, 'r') as file:
+                match = re.search(class_regex, file.read(), re.MULTILINE)
+            if match and match.group(2):
+                extended_classes.add(re.match(r'extends\s+(\w+)', match.group(2)).group(1))
+
+        adapted_classes = []
+        skipped_classes = 0
+        for path in model_paths:
+            with open(path, 'r') as file:
+                file_contents = file.read()
+
+            match = re.search(class_regex, file_contents, re.MULTILINE)
+            if not match or match.group(2) or match.group(1) in extended_classes:
+                # Enums carry their own adapter, and inherited members aren't accessible from the nested adapter
+                skipped_classes += 1
+                continue
+            class_name = match.group(1)
+
+            fields = re.findall(field_regex, file_contents)
+            adapter = self._build_streaming_adapter(class_name, fields)
+
+            package_match = re.search(r'^package [\w.]+;\n', file_contents, re.MULTILINE)
+            imports = '\n' + ''.join(f'import {name};\n' for name in streaming_adapter_imports)
+            class_end = file_contents.rindex('}')
+            file_contents = (file_contents[:package_match.end()] + imports + file_contents[package_match.end():class_end]
+                             + adapter + file_contents[class_end:])
+
+            with open(path, 'w') as file:
+                file.write(file_contents)
+            adapted_classes.append(class_name)
+
+        factory_contents = (f'package {model_package};\n\n'
+                            'import com.google.gson.Gson;\n'
+                            'import com.google.gson.TypeAdapter;\n'
+                            'import com.google.gson.reflect.TypeToken;\n'
+                            f'import {self._get_invoker_package()}.ModelTypeAdapters;\n\n'
+                            '/**\n'
+                            ' * Provides the reflection-free streaming adapters of the models in this package\n'
+                            ' */\n'
+                            f'public class {type_adapter_factory_class} implements ModelTypeAdapters {{\n'
+                            '  @SuppressWarnings("unchecked")\n'
+                            '  @Override\n'
+                            '  public <T> TypeAdapter<T> create(Gson gson, TypeToken<T> type) {\n'
+                            '    Class<? super T> rawType = type.getRawType();\n'
+                            + ''.join(f'    if (rawType == {class_name}.class) {{\n'
+                                      f'      return (TypeAdapter<T>) new {class_name}.StreamingAdapter(gson);\n'
+                                      '    }\n' for class_name in adapted_classes) +
+                            '    return null;\n'
+                            '  }\n'
+                            '}\n')
+        with open(os.path.join(model_dir, f'{type_adapter_factory_class}.java'), 'w') as file:
+            file.write(factory_contents)
+
+        services_dir = os.path.join(generator_output_dir, "src", "main", "resources", "META-INF", "services")
+        os.makedirs(services_dir, exist_ok=True)
+        with open(os.path.join(services_dir, f"{self._get_invoker_package()}.ModelTypeAdapters"), 'w') as file:
+            file.write(f'{model_package}.{type_adapter_factory_class}\n')
+
+        print(f"  Generated streaming adapters for {len(adapted_classes)} models")
+        print(f"  Skipped {skipped_classes} enums, subclasses and extended models")
+
+    @staticmethod
+    def _register_type_adapter_factories(json_file):
+        """
+        Makes the JSON class register every ModelTypeAdapters factory published on the classpath, so the streaming
+        adapters of each version's models are picked up without the common classes depending on any version
+
+        :param json_file: path of the generated JSON.java
+        """
+        with open(json_file, 'r') as file:
+            file_contents = file.read()
+
+        builder_regex = r'( *)GsonBuilder builder = fireBuilder\.createGsonBuilder\(\);\n'
+        match = re.search(builder_regex, file_contents)
+        if not match:
+            raise Exception("_registerTypeAdapterFactories: failed to find the GsonBuilder creation")
+
+        indent = match.group(1)
+        registration = f'{indent}ModelTypeAdaptersLoader.registerAll(builder);\n'
+        file_contents = file_contents[:match.end()] + registration + file_contents[match.end():]
+
+        with open(json_file, 'w') as file:
+            file.write(file_contents)
+
+    def _get_common_source_dir(self, generator_output_dir):
+        return os.path.join(generator_output_dir, "src", "main", "java", "com", "purestorage", "rest", self.product, "common")
+
+    def _add_common_sources(self, generator_output_dir, source_names):
+        """
+        Copies Java sources bundled with these scripts to the common package of the generated code
+
+        :param generator_output_dir: directory containing the generator output for this version
+        :param source_names: names of the classes to copy from the java/common directory
+        """
+        self._copy_java_templates(java_common_sources_dir, self._get_common_source_dir(generator_output_dir), source_names)
+
+    def _add_common_tests(self, project_dir, test_names):
+        """
+        Copies Java tests bundled with these scripts to the project holding the common classes
+
+        :param project_dir: directory of the project holding the common classes
+        :param test_names: names of the classes to copy from the java/common_test directory
+        """
+        test_dir = os.path.join(project_dir, "src", "test", "java", *self._get_invoker_package().split('.'))
+        os.makedirs(test_dir, exist_ok=True)
+        self._copy_java_templates(java_common_test_sources_dir, test_dir, test_names)
+
+    def _copy_java_templates(self, template_dir, target_dir, names):
+        invoker_package = self._get_invoker_package()
+        for name in names:
+            with open(os.path.join(template_dir, f"{name}.java"), 'r') as file:
+                file_contents = file.read()
+            with open(os.path.join(target_dir, f"{name}.java"), 'w') as file:
+                file.write(file_contents.replace("{{invokerPackage}}", invoker_package))
+
+    @staticmethod
+    def _add_api_client_members(file_contents, members):
+        """
+        Inserts members at the top of the ApiClient class
+
+        :param file_contents: contents of the generated ApiClient.java
+        :param members: java source of the members
+        :return: updated contents
+        """
+        match = re.search(r'public class ApiClient \{\n', file_contents)
+        if not match:
+            raise Exception("_addApiClientMembers: failed to find the ApiClient class")
+        return file_contents[:match.end()] + members + file_contents[match.end():]
+
+    @staticmethod
+    def _add_instrumentation_to_api_client(api_client_file):
+        """
+        Adds the instrumentation listener setter to the ApiClient, and moves the operation name passed by the generated
+        API calls from the headers to the request tag, where the instrumentation interceptor reads it
+
+        :param api_client_file: path of the generated ApiClient.java
+        """
+        with open(api_client_file, 'r') as file:
+            file_contents = file.read()
+
+        file_contents = JavaHandler._add_api_client_members(file_contents, (
+            '\n'
+            '    /**\n'
+            '     * Pseudo header the generated API calls use to pass their operation name. It is never sent.\n'
+            '     */\n'
+            f'    public static final String OPERATION_NAME_HEADER = "{operation_name_header}";\n'
+            '\n'
+            '    private InstrumentationInterceptor instrumentationInterceptor;\n'
+            '\n'
+            '    /**\n'
+            '     * Report the metrics of every call made by this client to the given listener.\n'
+            '     * No interceptor is installed while no listener is set. The listener must be set again after\n'
+            '     * replacing the HTTP client.\n'
+            '     *\n'
+            '     * @param listener Listener to report to, or null to stop reporting\n'
+            '     * @return Api client\n'
+            '     */\n'
+            '    public ApiClient setInstrumentationListener(InstrumentationListener listener) {\n'
+            '        if (instrumentationInterceptor != null) {\n'
+            '            httpClient.interceptors().remove(instrumentationInterceptor);\n'
+            '            instrumentationInterceptor = null;\n'
+            '        }\n'
+            '        if (listener != null) {\n'
+            '            instrumentationInterceptor = new InstrumentationInterceptor(listener);\n'
+            '            httpClient.interceptors().add(0, instrumentationInterceptor);\n'
+            '        }\n'
+            '        return this;\n'
+            '    }\n'))
+
+        # The header params may belong to the caller, so the pseudo header is dropped from the request rather than
+        # from the map
+        match = re.search(r'( *)processHeaderParams\(headerParams, reqBuilder\);\n', file_contents)
+        if not match:
+            raise Exception("_addInstrumentationToApiClient: failed to find the header processing of buildRequest")
+        indent = match.group(1)
+        file_contents = (file_contents[:match.start()]
+                         + f'{indent}reqBuilder.tag(headerParams.get(OPERATION_NAME_HEADER));\n'
+                         + file_contents[match.start():match.end()]
+                         + f'{indent}reqBuilder.removeHeader(OPERATION_NAME_HEADER);\n'
+                         + file_contents[match.end():])
+
+        with open(api_client_file, 'w') as file:
+            file.write(file_contents)
+
+    @staticmethod
+    def _add_retry_to_api_client(api_client_file):
+        """
+        Adds the retry policy and rate limiter setters to the ApiClient, and applies the default retry policy to new
+        clients
+
+        :param api_client_file: path of the generated ApiClient.java
+        """
+        with open(api_client_file, 'r') as file:
+            file_contents = file.read()
+
+        file_contents = JavaHandler._add_api_client_members(file_contents, (
+            '\n'
+            '    private RetryInterceptor retryInterceptor;\n'
+            '    private HostRateLimiter rateLimiter;\n'
+            '\n'
+            '    /**\n'
+            '     * Retry failed calls according to the given policy. Clients start with the default RetryPolicy.\n'
+            '     * The policy must be set again after replacing the HTTP client.\n'
+            '     *\n'
+            '     * @param retryPolicy Policy to apply, or null to disable retries\n'
+            '     * @return Api client\n'
+            '     */\n'
+            '    public ApiClient setRetryPolicy(RetryPolicy retryPolicy) {\n'
+            '        if (retryInterceptor != null) {\n'
+            '            httpClient.interceptors().remove(retryInterceptor);\n'
+            '            retryInterceptor = null;\n'
+            '        }\n'
+            '        if (retryPolicy != null) {\n'
+            '            retryInterceptor = new RetryInterceptor(retryPolicy);\n'
+            '            // Retries must go through the rate limiter\n'
+            '            int index = httpClient.interceptors().indexOf(rateLimiter);\n'
+            '            httpClient.interceptors().add(index < 0 ? httpClient.interceptors().size() : index, retryInterceptor);\n'
+            '        }\n'
+            '        return this;\n'
+            '    }\n'
+            '\n'
+            '    /**\n'
+            '     * Get the retry policy\n'
+            '     *\n'
+            '     * @return Retry policy, or null if retries are disabled\n'
+            '     */\n'
+            '    public RetryPolicy getRetryPolicy() {\n'
+            '        return retryInterceptor == null ? null : retryInterceptor.getPolicy();\n'
+            '    }\n'
+            '\n'
+            '    /**\n'
+            '     * Limit the rate of requests sent to each host. The same limiter can be set on several clients to limit\n'
+            '     * their combined rate. The limiter must be set again after replacing the HTTP client.\n'
+            '     *\n'
+            '     * @param rateLimiter Rate limiter, or null to stop limiting\n'
+            '     * @return Api client\n'
+            '     */\n'
+            '    public ApiClient setRateLimiter(HostRateLimiter rateLimiter) {\n'
+            '        if (this.rateLimiter != null) {\n'
+            '            httpClient.interceptors().remove(this.rateLimiter);\n'
+            '        }\n'
+            '        this.rateLimiter = rateLimiter;\n'
+            '        if (rateLimiter != null) {\n'
+            '            httpClient.interceptors().add(rateLimiter);\n'
+            '        }\n'
+            '        return this;\n'
+            '    }\n'))
+
+        match = re.search(r'( *)httpClient = new OkHttpClient\(\);\n', file_contents)
+        if not match:
+            raise Exception("_addRetryToApiClient: failed to find the HTTP client creation")
+        file_contents = (file_contents[:match.end()] + f'{match.group(1)}setRetryPolicy(new RetryPolicy());\n'
+                         + file_contents[match.end():])
+
+        with open(api_client_file, 'w') as file:
+            file.write(file_contents)
+
+    def _add_operation_names_to_api_calls(self, generator_output_dir, version):
+        """
+        Makes each generated API call pass its operation name to the ApiClient, so calls can be reported per operation.
+        The name is the one of the generated Java method, which is the spec's operationId as converted by Swagger Codegen
+
+        :param generator_output_dir: directory containing the generator output for this version
+        :param version: version being generated
+        """
+        api_dir = os.path.join(generator_output_dir, "src", "main", "java", *self._get_api_package(version).split('.'))
+        header_params_regex = r'( *)Map<String, String> localVarHeaderParams = new HashMap<String, String>\(\);\n'
+
+        total_operations = 0
+        for path in glob.glob(os.path.join(api_dir, '*.java')):
+            with open(path, 'r') as file:
+                file_contents = file.read()
+
+            new_contents = ''
+            position = 0
+            for call_match in re.finditer(r'public (?:com\.squareup\.okhttp\.)?Call (\w+)Call\(', file_contents):
+                match = re.compile(header_params_regex).search(file_contents, call_match.end())
+                if not match:
+                    raise Exception(f"_addOperationNamesToApiCalls: failed to find the header params of {call_match.group(1)}")
+                operation = f'{match.group(1)}localVarHeaderParams.put(ApiClient.OPERATION_NAME_HEADER, "{call_match.group(1)}");\n'
+                new_contents += file_contents[position:match.end()] + operation
+                position = match.end()
+                total_operations += 1
+            new_contents += file_contents[position:]
+
+            with open(path, 'w') as file:
+                file.write(new_contents)
+
+        print(f"  Tagged {total_operations} operations")
+
     def post_process(self, version, generator_output_dir, working_dir, build_output_root_dir, artifact_version,
                      first_version=False):
         """
@@ -292,6 +769,22 @@ class JavaHandler(LaunguageHandlerBase):
         # The readme has very wrong documentation. Remove it to prevent confusion
         os.remove(os.path.join(generator_output_dir, "README.md"))
 
+        print("Registering type adapter factories")
+        self._add_common_sources(generator_output_dir, type_adapter_sources)
+        self._register_type_adapter_factories(os.path.join(self._get_common_source_dir(generator_output_dir), "JSON.java"))
+
+        print("Adding instrumentation")
+        self._add_common_sources(generator_output_dir, instrumentation_sources)
+        self._add_instrumentation_to_api_client(os.path.join(self._get_common_source_dir(generator_output_dir), "ApiClient.java"))
+        self._add_operation_names_to_api_calls(generator_output_dir, version)
+
+        print("Adding retry policy and rate limiter")
+        self._add_common_sources(generator_output_dir, retry_sources)
+        self._add_retry_to_api_client(os.path.join(self._get_common_source_dir(generator_output_dir), "ApiClient.java"))
+
+        print("Adding fleet client")
+        self._add_common_sources(generator_output_dir, fleet_sources)
+
         if self.product == 'flasharray':
             if first_version:
                 print("Extracting common classes")
@@ -302,6 +795,7 @@ class JavaHandler(LaunguageHandlerBase):
                 tests_path = os.path.join(common_path, "src", "test")
                 if os.path.isdir(tests_path):
                     shutil.rmtree(tests_path)
+                self._add_common_tests(common_path, common_test_sources)
                 replace_text(os.path.join(common_path, 'pom.xml'), self._get_artifact_id(version), self.common_artifact_id)
                 replace_text(
                     os.path.join(common_path, "src", "main", "java", "com", "purestorage", "rest", self.product, "common", "JSON.java"),
@@ -314,10 +808,14 @@ class JavaHandler(LaunguageHandlerBase):
 
             shutil.rmtree(os.path.join(generator_output_dir, "src", "main", "java", "com", "purestorage", "rest", self.product, "common"))
             self._add_common_dependency_to_pom(os.path.join(generator_output_dir, 'pom.xml'), artifact_version)
+        else:
+            self._add_common_tests(generator_output_dir, common_test_sources)
         print("Removing duplicate models")
         self._remove_duplicate_models((os.path.join(generator_output_dir, "src")))
         print("Adding Shadow Nullable Variables")
         self._modify_shadow_nullable_variables((os.path.join(generator_output_dir, "src")), shadow_nullable_varibles)
+        print("Generating streaming type adapters")
+        self._generate_streaming_type_adapters(generator_output_dir, version)
 
 def get_language_handler(product: str, language: str) -> LaunguageHandlerBase:
     if language == 'java':
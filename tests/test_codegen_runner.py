@@ -0,0 +1,180 @@
+# The sample script and documentation are provided AS IS and are not supported by
+# the author or the author's employer, unless otherwise agreed in writing. You bear
+# all risk relating to the use or performance of the sample script and documentation.
+# The author and the author's employer disclaim all express or implied warranties
+# (including, without limitation, any warranties of merchantability, title, infringement
+# or fitness for a particular purpose). In no event shall the author, the author's employer
+# or anyone else involved in the creation, production, or delivery of the scripts be liable
+# for any damages whatsoever arising out of the use or performance of the sample script and
+# documentation (including, without limitation, damages for loss of business profits,
+# business interruption, loss of business information, or other pecuniary loss), even if
+# such person has been advised of the possibility of such damages.
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from scripts.codegen_runner import (JvmCodegenRunner, ProcessCodegenRunner, _find_javac, codegen_system_properties,
+                                    get_codegen_runner)
+
+# Stands in for the JVM running CodegenLauncher. It records its arguments, logs each job to stderr, and answers OK,
+# FAILED or exits depending on the spec name
+STUB_LAUNCHER = '''import json, sys
+with open(sys.argv[1], 'w') as file:
+    json.dump(sys.argv[2:], file)
+for line in sys.stdin:
+    spec = line.rstrip('\\n').split('\\t')[0]
+    sys.stderr.write(f"generating {spec}\\n")
+    sys.stderr.flush()
+    if 'crash' in spec:
+        sys.exit(3)
+    print('FAILED' if 'fail' in spec else 'OK', flush=True)
+'''
+
+
+def _completed(returncode):
+    return subprocess.CompletedProcess([], returncode, stdout='', stderr='')
+
+
+@unittest.skipIf(os.name == 'nt', "The stub launcher is run through a shebang")
+class JvmCodegenRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        self.arguments_file = os.path.join(self.working_dir, 'arguments.json')
+        self.java_binary = os.path.join(self.working_dir, 'java')
+        with open(self.java_binary, 'w') as file:
+            file.write(f'#!/bin/sh\nexec "{sys.executable}" "{self.java_binary}.py" "{self.arguments_file}" "$@"\n')
+        os.chmod(self.java_binary, 0o755)
+        with open(self.java_binary + '.py', 'w') as file:
+            file.write(STUB_LAUNCHER)
+
+        with mock.patch('scripts.codegen_runner.subprocess.run', return_value=_completed(0)) as run, \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.runner = JvmCodegenRunner(self.java_binary, '/jdk/bin/javac', 'swagger-codegen-cli.jar',
+                                           self.working_dir)
+        self.javac_command = run.call_args[0][0]
+
+    def tearDown(self):
+        self.runner.close()
+        shutil.rmtree(self.working_dir)
+
+    def _generate(self, spec):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.runner.generate(spec, 'out', 'java', 'config.json')
+        return output.getvalue()
+
+    def test_launcher_is_compiled_against_the_swagger_jar(self):
+        self.assertEqual('/jdk/bin/javac', self.javac_command[0])
+        self.assertEqual(['-cp', 'swagger-codegen-cli.jar'], self.javac_command[1:3])
+        self.assertTrue(self.javac_command[-1].endswith('CodegenLauncher.java'))
+
+    def test_system_properties_are_passed_to_the_jvm(self):
+        self._generate('a.yaml')
+        with open(self.arguments_file, 'r') as file:
+            arguments = json.load(file)
+        self.assertEqual(codegen_system_properties, arguments[:len(codegen_system_properties)])
+        self.assertEqual('CodegenLauncher', arguments[-1])
+
+    def test_jobs_run_in_one_process(self):
+        self._generate('a.yaml')
+        pid = self.runner.process.pid
+        self._generate('b.yaml')
+        self.assertEqual(pid, self.runner.process.pid)
+        self.assertIsNone(self.runner.process.poll())
+
+    def test_failure_prints_only_its_own_log(self):
+        self._generate('a.yaml')
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertRaisesRegex(Exception, "failed to generate fail.yaml"):
+            self.runner.generate('fail.yaml', 'out', 'java', 'config.json')
+        self.assertIn("generating fail.yaml", output.getvalue())
+        self.assertNotIn("generating a.yaml", output.getvalue())
+
+        # The launcher keeps running after a failed job
+        self._generate('b.yaml')
+
+    def test_jvm_exit_is_reported_with_its_code(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertRaisesRegex(Exception, "exited with code 3"):
+            self.runner.generate('crash.yaml', 'out', 'java', 'config.json')
+        self.assertIn("generating crash.yaml", output.getvalue())
+
+    def test_close_stops_the_jvm(self):
+        self._generate('a.yaml')
+        self.runner.close()
+        self.assertEqual(0, self.runner.process.returncode)
+        self.assertTrue(self.runner.log_file.closed)
+
+
+class FindJavacTest(unittest.TestCase):
+    def test_finds_javac_next_to_java(self):
+        with mock.patch('scripts.codegen_runner.os.path.isfile', side_effect=lambda path: path == '/jdk/bin/javac'):
+            self.assertEqual('/jdk/bin/javac', _find_javac('/jdk/bin/java'))
+
+    def test_resolves_java_symlinks(self):
+        with mock.patch('scripts.codegen_runner.os.path.realpath', return_value='/jdk/bin/java'), \
+                mock.patch('scripts.codegen_runner.os.path.isfile', side_effect=lambda path: path == '/jdk/bin/javac'):
+            self.assertEqual('/jdk/bin/javac', _find_javac('/usr/bin/java'))
+
+    def test_finds_windows_javac(self):
+        with mock.patch('scripts.codegen_runner.os.path.isfile', side_effect=lambda path: path == 'C:/jdk/bin/javac.exe'):
+            self.assertEqual('C:/jdk/bin/javac.exe', _find_javac('C:/jdk/bin/java.EXE'))
+
+    def test_returns_none_without_javac(self):
+        with mock.patch('scripts.codegen_runner.os.path.isfile', return_value=False):
+            self.assertIsNone(_find_javac('/jre/bin/java'))
+
+
+class GetCodegenRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.working_dir)
+
+    def _get_runner(self, runner):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return get_codegen_runner(runner, '/jdk/bin/java', 'swagger-codegen-cli.jar', self.working_dir)
+
+    def test_process_runner(self):
+        self.assertIsInstance(self._get_runner('process'), ProcessCodegenRunner)
+
+    def test_falls_back_without_javac(self):
+        with mock.patch('scripts.codegen_runner.os.path.isfile', return_value=False), \
+                mock.patch('scripts.codegen_runner.subprocess.run') as run:
+            self.assertIsInstance(self._get_runner('jvm'), ProcessCodegenRunner)
+        run.assert_not_called()
+
+    def test_falls_back_when_compilation_fails(self):
+        with mock.patch('scripts.codegen_runner.os.path.isfile', return_value=True), \
+                mock.patch('scripts.codegen_runner.subprocess.run', return_value=_completed(1)) as run, \
+                mock.patch('scripts.codegen_runner.subprocess.Popen') as popen:
+            self.assertIsInstance(self._get_runner('jvm'), ProcessCodegenRunner)
+        self.assertEqual('/jdk/bin/javac', run.call_args[0][0][0])
+        popen.assert_not_called()
+
+    def test_process_runner_passes_system_properties(self):
+        runner = ProcessCodegenRunner('/jdk/bin/java', 'swagger-codegen-cli.jar')
+        with mock.patch('scripts.codegen_runner.subprocess.run', return_value=_completed(0)) as run, \
+                contextlib.redirect_stdout(io.StringIO()):
+            runner.generate('a.yaml', 'out', 'java', 'config.json')
+        self.assertEqual(['/jdk/bin/java', *codegen_system_properties, '-jar', 'swagger-codegen-cli.jar', 'generate',
+                          '-i', 'a.yaml', '-o', 'out', '-l', 'java', '-c', 'config.json'], run.call_args[0][0])
+
+    def test_process_runner_raises_on_failure(self):
+        runner = ProcessCodegenRunner('/jdk/bin/java', 'swagger-codegen-cli.jar')
+        with mock.patch('scripts.codegen_runner.subprocess.run', return_value=_completed(1)), \
+                contextlib.redirect_stdout(io.StringIO()), self.assertRaises(subprocess.CalledProcessError):
+            runner.generate('a.yaml', 'out', 'java', 'config.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
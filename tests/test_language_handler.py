@@ -0,0 +1,338 @@
+# The sample script and documentation are provided AS IS and are not supported by
+# the author or the author's employer, unless otherwise agreed in writing. You bear
+# all risk relating to the use or performance of the sample script and documentation.
+# The author and the author's employer disclaim all express or implied warranties
+# (including, without limitation, any warranties of merchantability, title, infringement
+# or fitness for a particular purpose). In no event shall the author, the author's employer
+# or anyone else involved in the creation, production, or delivery of the scripts be liable
+# for any damages whatsoever arising out of the use or performance of the sample script and
+# documentation (including, without limitation, damages for loss of business profits,
+# business interruption, loss of business information, or other pecuniary loss), even if
+# such person has been advised of the possibility of such damages.
+
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from scripts.language_handler import JavaHandler, shadow_nullable_varibles
+
+MODEL_HEADER = '''package com.purestorage.rest.flasharray.v2_13.model;
+
+import java.util.Objects;
+import com.google.gson.annotations.JsonAdapter;
+import com.google.gson.annotations.SerializedName;
+import java.util.List;
+import java.util.Map;
+'''
+
+VOLUME_MODEL = MODEL_HEADER + '''
+public class Volume {
+  @SerializedName("name")
+  private String name = null;
+
+  @SerializedName("destroyed")
+  private Boolean destroyed = null;
+
+  @SerializedName("provisioned")
+  private Long provisioned = null;
+
+  @SerializedName("priority")
+  private Integer priority = null;
+
+  @SerializedName("reduction")
+  private Double reduction = null;
+
+  @SerializedName("ratio")
+  private Float ratio = null;
+
+  @JsonAdapter(StatusEnum.Adapter.class)
+  public enum StatusEnum {
+    OK("ok");
+
+    private String value;
+
+    StatusEnum(String value) {
+      this.value = value;
+    }
+  }
+
+  @SerializedName("status")
+  private StatusEnum status = null;
+
+  @SerializedName("tags")
+  private List<Tag> tags = null;
+
+  @SerializedName("labels")
+  private Map<String, String> labels = null;
+
+  @SerializedName("qos")
+  private Qos qos = null;
+}
+'''
+
+QOS_MODEL = MODEL_HEADER + '''
+public class Qos {
+  @SerializedName("bandwidth_limit")
+  private Long bandwidthLimit = null;
+
+  @SerializedName("iops_limit")
+  private Long iopsLimit = null;
+
+  public Long getBandwidthLimit() {
+    return bandwidthLimit;
+  }
+
+  public Long getIopsLimit() {
+    return iopsLimit;
+  }
+}
+'''
+
+RESOURCE_MODEL = MODEL_HEADER + '''
+public class Resource {
+  @SerializedName("id")
+  private String id = null;
+}
+'''
+
+HOST_MODEL = MODEL_HEADER + '''
+public class Host extends Resource {
+  @SerializedName("iqns")
+  private List<String> iqns = null;
+}
+'''
+
+KIND_MODEL = MODEL_HEADER + '''
+@JsonAdapter(Kind.Adapter.class)
+public enum Kind {
+  A("a");
+}
+'''
+
+
+class StreamingTypeAdapterTest(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.model_dir = os.path.join(self.output_dir, "src", "main", "java", "com", "purestorage", "rest",
+                                      "flasharray", "v2_13", "model")
+        os.makedirs(self.model_dir)
+        for name, contents in [("Volume", VOLUME_MODEL), ("Qos", QOS_MODEL), ("Resource", RESOURCE_MODEL),
+                               ("Host", HOST_MODEL), ("Kind", KIND_MODEL)]:
+            with open(os.path.join(self.model_dir, f"{name}.java"), 'w') as file:
+                file.write(contents)
+
+        handler = JavaHandler('flasharray')
+        handler._modify_shadow_nullable_variables(os.path.join(self.output_dir, "src"), shadow_nullable_varibles)
+        handler._generate_streaming_type_adapters(self.output_dir, '2.13')
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def _read_model(self, name):
+        with open(os.path.join(self.model_dir, f"{name}.java"), 'r') as file:
+            return file.read()
+
+    def _read_case(self, contents, json_name):
+        match = re.search(f'          case "{json_name}":\\n(.*?)            break;\\n', contents, re.DOTALL)
+        self.assertIsNotNone(match, f"No read case for {json_name}")
+        return match.group(1)
+
+    def test_primitives_are_read_and_written_directly(self):
+        contents = self._read_model("Volume")
+        expected_reads = {
+            "name": "instance.name = in.peek() == JsonToken.BOOLEAN ? Boolean.toString(in.nextBoolean()) : in.nextString();",
+            "destroyed": "instance.destroyed = in.peek() == JsonToken.STRING ? Boolean.parseBoolean(in.nextString()) : in.nextBoolean();",
+            "provisioned": "instance.provisioned = in.nextLong();",
+            "priority": "instance.priority = in.nextInt();",
+            "reduction": "instance.reduction = in.nextDouble();",
+            "ratio": "instance.ratio = (float) in.nextDouble();",
+        }
+        for json_name, read in expected_reads.items():
+            variable = read.split(' ')[0].split('.')[1]
+            case = self._read_case(contents, json_name)
+            self.assertIn("if (in.peek() == JsonToken.NULL) {", case)
+            self.assertIn(f"instance.{variable} = null;", case)
+            self.assertIn(read, case)
+            self.assertIn(f'      out.name("{json_name}");\n      out.value(value.{variable});\n', contents)
+            self.assertNotIn(f"{variable}Adapter", contents)
+
+    def test_integer_reads_wrap_number_format_errors(self):
+        contents = self._read_model("Volume")
+        self.assertIn("import com.google.gson.JsonSyntaxException;", contents)
+        for json_name, read in [("priority", "instance.priority = in.nextInt();"),
+                                ("provisioned", "instance.provisioned = in.nextLong();")]:
+            self.assertIn(f"              try {{\n                {read}\n"
+                          "              } catch (NumberFormatException e) {\n"
+                          "                throw new JsonSyntaxException(e);\n"
+                          "              }\n", self._read_case(contents, json_name))
+        for json_name in ["name", "destroyed", "reduction", "ratio"]:
+            self.assertNotIn("NumberFormatException", self._read_case(contents, json_name))
+
+    def test_containers_are_delegated_to_gson(self):
+        contents = self._read_model("Volume")
+        self.assertIn("private final TypeAdapter<List<Tag>> tagsAdapter;", contents)
+        self.assertIn("this.tagsAdapter = gson.getAdapter(new TypeToken<List<Tag>>() {});", contents)
+        self.assertIn("private final TypeAdapter<Map<String, String>> labelsAdapter;", contents)
+        self.assertIn("this.labelsAdapter = gson.getAdapter(new TypeToken<Map<String, String>>() {});", contents)
+        self.assertIn("instance.tags = tagsAdapter.read(in);", self._read_case(contents, "tags"))
+        self.assertIn("instance.labels = labelsAdapter.read(in);", self._read_case(contents, "labels"))
+        self.assertIn("labelsAdapter.write(out, value.labels);", contents)
+
+    def test_inner_enums_and_models_are_delegated_to_gson(self):
+        contents = self._read_model("Volume")
+        self.assertIn("this.statusAdapter = gson.getAdapter(StatusEnum.class);", contents)
+        self.assertIn("instance.status = statusAdapter.read(in);", self._read_case(contents, "status"))
+        self.assertIn('      out.name("status");\n      if (value.status == null) {\n        out.nullValue();\n'
+                      '      } else {\n        statusAdapter.write(out, value.status);\n      }\n', contents)
+        self.assertIn("this.qosAdapter = gson.getAdapter(Qos.class);", contents)
+
+    def test_shadow_nullable_variables_keep_numbers_and_cleared_values(self):
+        contents = self._read_model("Qos")
+        self.assertIn("private Object bandwidthLimit = null;", contents)
+        case = self._read_case(contents, "bandwidth_limit")
+        self.assertIn("} else if (in.peek() == JsonToken.NUMBER) {\n"
+                      "              instance.bandwidthLimit = in.nextDouble();\n", case)
+        self.assertIn("} else if (in.peek() == JsonToken.STRING) {\n"
+                      "              instance.bandwidthLimit = in.nextString();\n", case)
+        self.assertIn("if (value.iopsLimit instanceof String) {\n        out.value((String) value.iopsLimit);\n"
+                      "      } else if (value.iopsLimit instanceof Number) {\n"
+                      "        out.value((Number) value.iopsLimit);\n", contents)
+
+    def test_unknown_fields_are_skipped(self):
+        contents = self._read_model("Volume")
+        self.assertIn("          default:\n            in.skipValue();\n", contents)
+
+    def test_factory_only_covers_adapted_models(self):
+        with open(os.path.join(self.model_dir, "ModelTypeAdapterFactory.java"), 'r') as file:
+            factory = file.read()
+        self.assertIn("implements ModelTypeAdapters", factory)
+        self.assertIn("if (rawType == Volume.class) {", factory)
+        self.assertIn("if (rawType == Qos.class) {", factory)
+        for name in ["Resource", "Host", "Kind"]:
+            self.assertNotIn(f"{name}.class", factory)
+            self.assertNotIn("StreamingAdapter", self._read_model(name))
+
+        services_file = os.path.join(self.output_dir, "src", "main", "resources", "META-INF", "services",
+                                     "com.purestorage.rest.flasharray.common.ModelTypeAdapters")
+        with open(services_file, 'r') as file:
+            self.assertEqual("com.purestorage.rest.flasharray.v2_13.model.ModelTypeAdapterFactory\n", file.read())
+
+
+API_CLIENT = '''package com.purestorage.rest.flasharray.common;
+
+public class ApiClient {
+
+    private OkHttpClient httpClient;
+
+    public ApiClient() {
+        httpClient = new OkHttpClient();
+    }
+
+    public Request buildRequest(String path, String method, List<Pair> queryParams, List<Pair> collectionQueryParams, Object body, Map<String, String> headerParams, Map<String, Object> formParams, String[] authNames, ProgressRequestBody.ProgressRequestListener progressRequestListener) throws ApiException {
+        updateParamsForAuth(authNames, queryParams, headerParams);
+
+        final String url = buildUrl(path, queryParams, collectionQueryParams);
+        final Request.Builder reqBuilder = new Request.Builder().url(url);
+        processHeaderParams(headerParams, reqBuilder);
+
+        String contentType = (String) headerParams.get("Content-Type");
+        return reqBuilder.method(method, null).build();
+    }
+}
+'''
+
+VOLUMES_API = '''package com.purestorage.rest.flasharray.v2_13.api;
+
+public class VolumesApi {
+    public com.squareup.okhttp.Call getVolumesCall(String authorization, final ProgressResponseBody.ProgressListener progressListener, final ProgressRequestBody.ProgressRequestListener progressRequestListener) throws ApiException {
+        Object localVarPostBody = null;
+
+        Map<String, String> localVarHeaderParams = new HashMap<String, String>();
+        if (authorization != null)
+        localVarHeaderParams.put("Authorization", apiClient.parameterToString(authorization));
+
+        return apiClient.buildCall(localVarPath, "GET", localVarQueryParams, localVarCollectionQueryParams, localVarPostBody, localVarHeaderParams, localVarFormParams, localVarAuthNames, progressRequestListener);
+    }
+
+    private com.squareup.okhttp.Call getVolumesValidateBeforeCall(String authorization, final ProgressResponseBody.ProgressListener progressListener, final ProgressRequestBody.ProgressRequestListener progressRequestListener) throws ApiException {
+        com.squareup.okhttp.Call call = getVolumesCall(authorization, progressListener, progressRequestListener);
+        return call;
+    }
+
+    public Call deleteVolumesCall(final ProgressRequestBody.ProgressRequestListener progressRequestListener) throws ApiException {
+        Object localVarPostBody = null;
+
+        Map<String, String> localVarHeaderParams = new HashMap<String, String>();
+
+        return apiClient.buildCall(localVarPath, "DELETE", localVarQueryParams, localVarCollectionQueryParams, localVarPostBody, localVarHeaderParams, localVarFormParams, localVarAuthNames, progressRequestListener);
+    }
+}
+'''
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.api_client_file = os.path.join(self.output_dir, "ApiClient.java")
+        with open(self.api_client_file, 'w') as file:
+            file.write(API_CLIENT)
+        self.api_dir = os.path.join(self.output_dir, "src", "main", "java", "com", "purestorage", "rest",
+                                    "flasharray", "v2_13", "api")
+        os.makedirs(self.api_dir)
+        self.volumes_api_file = os.path.join(self.api_dir, "VolumesApi.java")
+        with open(self.volumes_api_file, 'w') as file:
+            file.write(VOLUMES_API)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def _read(self, path):
+        with open(path, 'r') as file:
+            return file.read()
+
+    def test_build_request_moves_operation_name_to_tag(self):
+        JavaHandler._add_instrumentation_to_api_client(self.api_client_file)
+        contents = self._read(self.api_client_file)
+        self.assertIn('    public static final String OPERATION_NAME_HEADER = "X-Operation-Name";\n', contents)
+        self.assertIn("        final Request.Builder reqBuilder = new Request.Builder().url(url);\n"
+                      "        reqBuilder.tag(headerParams.get(OPERATION_NAME_HEADER));\n"
+                      "        processHeaderParams(headerParams, reqBuilder);\n"
+                      "        reqBuilder.removeHeader(OPERATION_NAME_HEADER);\n", contents)
+
+    def test_build_request_leaves_header_params_untouched(self):
+        # The header params may be an immutable map owned by the caller
+        JavaHandler._add_instrumentation_to_api_client(self.api_client_file)
+        contents = self._read(self.api_client_file)
+        self.assertNotIn("headerParams.remove(", contents)
+        self.assertNotIn("headerParams.put(", contents)
+        self.assertNotIn("headerParams = ", contents)
+
+    def test_build_request_must_be_found(self):
+        with open(self.api_client_file, 'w') as file:
+            file.write(API_CLIENT.replace("processHeaderParams(headerParams, reqBuilder);", ""))
+        with self.assertRaises(Exception):
+            JavaHandler._add_instrumentation_to_api_client(self.api_client_file)
+
+    def test_api_calls_pass_their_operation_name(self):
+        JavaHandler('flasharray')._add_operation_names_to_api_calls(self.output_dir, '2.13')
+        contents = self._read(self.volumes_api_file)
+        self.assertIn('        Map<String, String> localVarHeaderParams = new HashMap<String, String>();\n'
+                      '        localVarHeaderParams.put(ApiClient.OPERATION_NAME_HEADER, "getVolumes");\n'
+                      '        if (authorization != null)\n', contents)
+        self.assertIn('        Map<String, String> localVarHeaderParams = new HashMap<String, String>();\n'
+                      '        localVarHeaderParams.put(ApiClient.OPERATION_NAME_HEADER, "deleteVolumes");\n', contents)
+        self.assertEqual(2, contents.count("ApiClient.OPERATION_NAME_HEADER"))
+        self.assertNotIn('"getVolumesValidateBefore"', contents)
+
+    def test_api_calls_must_have_header_params(self):
+        with open(self.volumes_api_file, 'w') as file:
+            file.write(VOLUMES_API.replace("Map<String, String> localVarHeaderParams = new HashMap<String, String>();\n"
+                                           "\n        return", "\n        return"))
+        with self.assertRaises(Exception):
+            JavaHandler('flasharray')._add_operation_names_to_api_calls(self.output_dir, '2.13')
+
+
+if __name__ == '__main__':
+    unittest.main()